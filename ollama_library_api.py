@@ -1,21 +1,38 @@
-import json
-from typing import List, Optional, Dict, Any, Union
+import orjson
+from typing import TYPE_CHECKING, List, Optional, Dict, Any, Union, Tuple, TypedDict
 from fastapi import FastAPI, HTTPException, Request, Query, Path as FastApiPath
-from fastapi.responses import FileResponse, HTMLResponse, JSONResponse # Import FileResponse and HTMLResponse
+from fastapi.responses import ORJSONResponse, Response
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel, Field, HttpUrl
-import requests
-import requests_cache
+import httpx
 from datetime import datetime, timezone, timedelta
 import uvicorn
-from bs4 import BeautifulSoup
-from urllib.parse import urlparse, urljoin
+import lxml.html
+import lxml.etree
+from lxml.cssselect import CSSSelector
+from urllib.parse import urlparse, urlsplit, urljoin
+from functools import lru_cache
 import re
+import html
 import os
+import sys
+import gzip
+import asyncio
+import threading
 import random
 import time
-from collections import deque
+from collections import deque, OrderedDict
 from dotenv import load_dotenv
 
+try: # Installed with httpx[brotli]: the brotli module on CPython, brotlicffi elsewhere
+    import brotli
+except ImportError:
+    try: import brotlicffi as brotli
+    except ImportError: brotli = None
+
+if TYPE_CHECKING:
+    import hishel
+
 load_dotenv()
 
 # --- Configuration ---
@@ -24,17 +41,103 @@ CODE_VERSION = os.getenv("CODE_VERSION", "Unknown_Release")
 OLLAMA_COM_BASE_URL = os.getenv("OLLAMA_COM_BASE_URL", "https://ollama.com")
 CURRENT_BASE_URL = os.getenv("CURRENT_BASE_URL", "https://example.com")
 STATIC_WEBSITE = os.getenv("STATIC_WEBSITE", "False") == "True" # RECOMMENDED "FALSE"
-CACHE_EXPIRE_AFTER = os.getenv("CACHE_EXPIRE_AFTER", 6) # HOURS
+CACHE_EXPIRE_AFTER = int(os.getenv("CACHE_EXPIRE_AFTER", 6)) # HOURS
+# Worker processes when run directly. Each keeps its own in-memory response caches, in-flight fetches and /ping
+# stats, and runs its own eviction sweep; only the SQLite page cache is shared. One unless asked for more.
+SERVER_WORKERS = int(os.getenv("SERVER_WORKERS", os.getenv("WEB_CONCURRENCY", 1)))
 
 # --- Configuration ---
 
 
-# Cache settings: SQLite backend, expires after 6 hours (21600 seconds)
-# Use a simple in-memory cache for demonstration/testing, persistent 'sqlite' is also an option
+# Cache settings: SQLite backend, expires after CACHE_EXPIRE_AFTER hours (6 hours = 21600 seconds)
+# The SQLite file survives restarts and is shared by every worker; WAL keeps readers from blocking the writer
 cachetime = CACHE_EXPIRE_AFTER * 3600
-requests_cache.install_cache('ollama_com_cache', backend='memory', expire_after=cachetime)
-# Use a CachedSession for all requests to ollama.com
-cached_session = requests_cache.CachedSession()
+CACHE_LIFETIME = timedelta(seconds=cachetime)
+# Async caching client used for all requests to ollama.com, so a fetch never blocks the event loop.
+# It is opened by each worker process at app startup rather than at import, so a pre-forking server
+# never shares one SQLite connection across workers.
+cached_client: Optional["hishel.AsyncCacheClient"] = None
+
+# WAL with synchronous=NORMAL, plus per-connection tuning for a read-heavy cache:
+# bigger page cache, mmap'd reads, in-memory temp tables
+CACHE_SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA temp_store=MEMORY",
+)
+CACHE_SQLITE_PATH = 'ollama_com_cache.sqlite'
+# hishel's table is created up front so it can be indexed (hishel itself only runs CREATE TABLE IF NOT EXISTS).
+# Without these, every lookup scans the table, reading past each stored page to reach date_created.
+CACHE_SQLITE_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS cache(key TEXT, data BLOB, date_created REAL)",
+    "CREATE INDEX IF NOT EXISTS cache_key_idx ON cache(key)",
+    "CREATE INDEX IF NOT EXISTS cache_date_created_idx ON cache(date_created)",
+)
+# Expired pages are swept on this period instead of by hishel before every lookup
+CACHE_EVICTION_INTERVAL = 60 # seconds
+cache_eviction_task: Optional[asyncio.Task] = None
+upstream_warmup_task: Optional[asyncio.Task] = None
+
+async def open_cached_client() -> "hishel.AsyncCacheClient":
+    import anysqlite
+    import hishel # Deferred: not needed until the first fetch
+    cache_connection = await anysqlite.connect(CACHE_SQLITE_PATH)
+    for statement in CACHE_SQLITE_PRAGMAS + CACHE_SQLITE_SCHEMA:
+        await cache_connection.execute(statement)
+    await cache_connection.commit()
+    # No ttl here: hishel would run an unindexable "date_created + ttl < now" DELETE before every lookup.
+    # evict_expired_cache_entries enforces cachetime instead.
+    # Hits are read-only: hishel's update_metadata re-serializes and rewrites the whole stored page (and commits)
+    # on every hit just to bump number_of_uses, which nothing here reads.
+    class ReadOnlyHitSQLiteStorage(hishel.AsyncSQLiteStorage):
+        async def update_metadata(self, key, response, request, metadata) -> None:
+            return None
+    storage = ReadOnlyHitSQLiteStorage(connection=cache_connection)
+    # Keep every successful page for cachetime whatever Cache-Control ollama.com sends
+    controller = hishel.Controller(force_cache=True)
+    # Cache misses reuse kept-alive (HTTP/2 where offered) connections to ollama.com instead of a new TLS handshake each.
+    # Pages arrive brotli/gzip-compressed and are stored that way; httpx decodes them when the body is read.
+    return hishel.AsyncCacheClient(
+        storage=storage, controller=controller, follow_redirects=True, http2=True,
+        headers={"Accept-Encoding": "br, gzip"},
+        limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+        timeout=httpx.Timeout(10.0, connect=3.0),
+    )
+
+async def warm_upstream_connection():
+    """Opens the pooled (HTTP/2) connection to ollama.com at startup, so the first request skips the handshake."""
+    try:
+        # Bypasses the cache so a connection is really made; HEAD keeps the exchange tiny and nothing is stored
+        await cached_client.head(OLLAMA_COM_BASE_URL, extensions={"cache_disabled": True})
+    except httpx.HTTPError as e:
+        print(f"Warning: Could not pre-connect to {OLLAMA_COM_BASE_URL}: {e}")
+
+async def evict_expired_cache_entries():
+    """Deletes pages older than cachetime every CACHE_EVICTION_INTERVAL seconds, through the date_created index."""
+    import anysqlite
+    # Its own connection, so a sweep never commits in the middle of one of hishel's writes
+    connection = None
+    try:
+        while True:
+            # hishel has no ttl to fall back on, so a failed sweep (locked or unreadable file) must not end the loop;
+            # the connection is reopened on the next pass
+            try:
+                if connection is None:
+                    connection = await anysqlite.connect(CACHE_SQLITE_PATH)
+                await connection.execute("DELETE FROM cache WHERE date_created < ?", [time.time() - cachetime])
+                await connection.commit()
+            except Exception as e:
+                print(f"Warning: Cache eviction sweep failed: {e}. Retrying in {CACHE_EVICTION_INTERVAL}s.")
+                if connection is not None:
+                    try: await connection.close()
+                    except Exception: pass
+                    connection = None
+            await asyncio.sleep(CACHE_EVICTION_INTERVAL)
+    finally:
+        if connection is not None:
+            await connection.close()
 
 # --- ROOT HTML ---
 dummy_html_content = """
@@ -44,8 +147,12 @@ dummy_html_content = """
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Ollama API Proxy</title>
+    <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
+    <link rel="preconnect" href="https://nextuiserver.htdevs.workers.dev" crossorigin>
+    <link rel="dns-prefetch" href="https://nextuiserver.htdevs.workers.dev">
     <link href="https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&family=JetBrains+Mono:wght@400;500&display=swap" rel="stylesheet">
     <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.7.2/css/all.min.css">
+    <script src="app.js?v=VERSION_BEING_REPLACED" defer></script>
     <style>
         :root {
             --bg-primary: #0f172a;
@@ -273,6 +380,9 @@ dummy_html_content = """
         text-align: center;
         transition: all 0.3s ease;
         cursor: pointer;
+        /* Off-screen cards skip style, layout and paint until scrolled near */
+        content-visibility: auto;
+        contain-intrinsic-size: auto 220px;
     }
 
     .app-card:hover {
@@ -452,7 +562,8 @@ dummy_html_content = """
         <section class="section animate-fade-in">
             <h2 class="section-title"><i class="fas fa-rocket"></i> Getting Started</h2>
             <div class="code-snippet">
-                <button class="copy-button" onclick="navigator.clipboard.writeText('http://localhost:5115/docs')">
+                <button class="copy-button" data-snippet="# Explore the API documentation
+$ open http://localhost:5115/docs">
                     <i class="far fa-copy"></i>
                 </button>
                 # Explore the API documentation
@@ -520,7 +631,7 @@ dummy_html_content = """
             </div>
             <div class="form-group">
                 <label>Website URL</label>
-                <input type="url" class="form-input" id="websiteUrl" required>
+                <input type="url" class="form-input" id="websiteUrl" pattern="https?://.+" required>
             </div>
             <button type="submit" class="submit-button">Submit Application</button>
         </form>
@@ -570,63 +681,82 @@ dummy_html_content = """
         </div>
     </footer>
 
-    <script>
+</body>
+</html>
+"""
+
+# Served as /app.js (and written next to static/index.html) so browsers cache it and fetch it while the page parses
+dummy_script_content = """
         function setversion(version) {
             if(!String(String(version).toLowerCase()).startsWith('v')) {
                 version = `v${version}`
             }
             document.getElementById('version').textContent = version
         }
-        document.querySelectorAll('a[href^="#"]').forEach(anchor => {
-            anchor.addEventListener('click', function (e) {
+        // One document-level listener handles in-page anchors and copy buttons, so setup never walks the DOM
+        document.addEventListener('click', function (e) {
+            const anchor = e.target.closest('a[href^="#"]');
+            if (anchor) {
                 e.preventDefault();
-                document.querySelector(this.getAttribute('href')).scrollIntoView({
+                document.querySelector(anchor.getAttribute('href'))?.scrollIntoView({
                     behavior: 'smooth'
                 });
-            });
-        });
+                return;
+            }
 
-        document.querySelectorAll('.copy-button').forEach(button => {
-            button.addEventListener('click', function() {
-                const snippet = this.parentElement.textContent.replace('Copy', '').trim();
+            const button = e.target.closest('.copy-button');
+            if (button) {
+                // Snippets carry their text in data-snippet; the text walk is only a fallback for buttons without one
+                const snippet = button.dataset.snippet ?? button.parentElement.textContent.replace('Copy', '').trim();
                 navigator.clipboard.writeText(snippet);
-                
-                const originalHTML = this.innerHTML;
-                this.innerHTML = '<i class="fas fa-check"></i> Copied!';
-                
+
+                const originalHTML = button.innerHTML;
+                button.innerHTML = '<i class="fas fa-check"></i> Copied!';
+
                 setTimeout(() => {
-                    this.innerHTML = originalHTML;
+                    button.innerHTML = originalHTML;
                 }, 2000);
-            });
+            }
         });
+        // Queues DOM writes and flushes them together in the next animation frame, so layout runs once per frame
+        function rafBatch(write) {
+            if (!rafBatch.queue) {
+                rafBatch.queue = [];
+                requestAnimationFrame(() => {
+                    const queue = rafBatch.queue;
+                    rafBatch.queue = null;
+                    queue.forEach(queuedWrite => queuedWrite());
+                });
+            }
+            rafBatch.queue.push(write);
+        }
+
             const modal = document.getElementById('submitModal');
     const openBtn = document.getElementById('openModal');
     const closeSpan = document.querySelector('.close-modal');
 
-    openBtn.onclick = () => modal.style.display = 'flex';
-    closeSpan.onclick = () => modal.style.display = 'none';
+    openBtn.onclick = () => rafBatch(() => modal.style.display = 'flex');
+    closeSpan.onclick = () => rafBatch(() => modal.style.display = 'none');
 
     window.onclick = (event) => {
         if (event.target === modal) {
-            modal.style.display = 'none';
+            rafBatch(() => modal.style.display = 'none');
         }
     }
         
+        // Set while a submission is on the wire, so double clicks and Enter presses don't POST twice
+        let submitInFlight = false;
+
         async function submitApp(event) {
             event.preventDefault();
+            if (submitInFlight) return;
             const name = document.getElementById('appName').value;
             const website = document.getElementById('websiteUrl').value;
             const statusMessage = document.getElementById('statusMessage');
 
-            try {
-                new URL(website);
-            } catch {
-                statusMessage.textContent = "Please enter a valid URL";
-                statusMessage.className = "status-message error";
-                statusMessage.style.display = 'block';
-                return;
-            }
-
+            const submitButton = event.target.querySelector('button[type="submit"]');
+            submitInFlight = true;
+            if (submitButton) submitButton.disabled = true;
             try {
                 const response = await fetch('https://nextuiserver.htdevs.workers.dev/ollamasearchapi/submit', {
                     method: 'POST',
@@ -642,10 +772,10 @@ dummy_html_content = """
             statusMessage.textContent = "App submitted successfully!";
             statusMessage.className = "status-message success";
             document.getElementById('appSubmitForm').reset();
-            setTimeout(() => {
+            setTimeout(() => rafBatch(() => {
                 modal.style.display = 'none';
                 statusMessage.style.display = 'none';
-            }, 2000);
+            }), 2000);
         } else {
                     statusMessage.textContent = data.error || "Submission failed";
                     statusMessage.className = "status-message error";
@@ -653,6 +783,9 @@ dummy_html_content = """
             } catch (error) {
                 statusMessage.textContent = "Network error - please try again";
                 statusMessage.className = "status-message error";
+            } finally {
+                submitInFlight = false;
+                if (submitButton) submitButton.disabled = false;
             }
             
             statusMessage.style.display = 'block';
@@ -661,53 +794,86 @@ dummy_html_content = """
             }, 5000);
         }
 
+        const HTML_ESCAPES = {'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'};
+        function escapeHTML(value) {
+            return String(value ?? '').replace(/[&<>"']/g, char => HTML_ESCAPES[char]);
+        }
+
+        // One click listener for every card, so re-rendering the grid never rebinds handlers
+        document.getElementById('apps-container').addEventListener('click', event => {
+            const card = event.target.closest('.app-card');
+            if (card) window.open(card.dataset.url, '_blank');
+        });
+
+        function renderApps(data) {
+            const container = document.getElementById('apps-container');
+
+            // Build the whole grid as one string and insert it once: a single parse and layout pass
+            const html = data.apps.map(app => {
+                const fullversion = app.version ? `<div class="app-version">${escapeHTML(app.version)}</div>` : '';
+                return `<div class="app-card" data-url="${escapeHTML(app.url)}">
+                    <img src="${escapeHTML(app.icon)}" class="app-icon" alt="${escapeHTML(app.name)}" width="80" height="80" loading="lazy" decoding="async">
+                    <div class="app-name">${escapeHTML(app.name)}</div>
+                    <div class="app-description">${escapeHTML(app.description)}</div>
+                    ${fullversion}
+                </div>`;
+            }).join('');
+
+            rafBatch(() => {
+                container.innerHTML = '';
+                container.insertAdjacentHTML('beforeend', html);
+            });
+        }
+
+        const APPS_CACHE_KEY = 'ollamasearchapi_apps_v1';
+
         async function loadPoweredApps() {
+            // Stale-while-revalidate: paint the list from this session's copy, then refresh it in the background
+            let cachedBody = null;
+            try {
+                cachedBody = sessionStorage.getItem(APPS_CACHE_KEY);
+                if (cachedBody) renderApps(JSON.parse(cachedBody));
+            } catch (error) {
+                cachedBody = null;
+            }
+
             try {
                 const response = await fetch('https://nextuiserver.htdevs.workers.dev/ollamasearchapi/getapps');
-                const data = await response.json();
-                const container = document.getElementById('apps-container');
-                
-                container.innerHTML = '';
-                
-                data.apps.forEach(app => {
-                    const card = document.createElement('div');
-                    card.className = 'app-card';
-                    card.onclick = () => window.open(app.url, '_blank');
-                    const fullversion = app.version ? `<div class="app-version">${app.version}</div>` : '';
-                    
-                    card.innerHTML = `
-                        <img src="${app.icon}" class="app-icon" alt="${app.name}">
-                        <div class="app-name">${app.name}</div>
-                        <div class="app-description">${app.description}</div>
-                        ${fullversion}
-                    `;
-                    
-                    container.appendChild(card);
-                });
+                const body = await response.text();
+                if (body === cachedBody) return;
+                renderApps(JSON.parse(body));
+                try { sessionStorage.setItem(APPS_CACHE_KEY, body); } catch (error) { /* storage full or disabled */ }
             } catch (error) {
                 console.error('Error loading powered apps:', error);
             }
         }
 
-    window.addEventListener('DOMContentLoaded', loadPoweredApps);
+    // The apps grid sits below the fold, so its fetch waits until the grid is about to scroll into view
+    function observeAppsGrid() {
+        const container = document.getElementById('apps-container');
+        if (!('IntersectionObserver' in window)) {
+            loadPoweredApps();
+            return;
+        }
+        const observer = new IntersectionObserver((entries, obs) => {
+            if (entries.some(entry => entry.isIntersecting)) {
+                obs.disconnect();
+                loadPoweredApps();
+            }
+        }, { rootMargin: '400px' });
+        observer.observe(container);
+    }
+
+    window.addEventListener('DOMContentLoaded', observeAppsGrid);
 
         setversion('VERSION_BEING_REPLACED')
-    </script>
-</body>
-</html>
 """
 
 # --- DO NOT CHANGE WITHOUT KNOWLEDGE ---
 
 Static_Website = STATIC_WEBSITE
+# The landing page is served from memory (INDEX_HTML_BYTES); static/index.html is only written for static hosting
 filename = 'index.html'
-format = 'html'
-TEMPTEXT = f'{int(time.time() * 1000)}{format}'
-FILETEMPTEXT = f'tempfile_{TEMPTEXT}.html'
-
-if Static_Website == True:
-    TEMPTEXT = f'index'
-    FILETEMPTEXT = f'index.html'
 # --- Pydantic Models ---
 
 class CacheInfoMixin(BaseModel):
@@ -719,6 +885,9 @@ class CacheInfoMixin(BaseModel):
 class FilterInfo(BaseModel):
     capabilities: Optional[List[str]] = None
 
+# Everything the parse_* functions emit is already well-formed, so none of it is validated: listing rows stay
+# plain dicts, other nested rows are built with .construct(), and endpoints .construct() the response envelopes.
+# The models still describe every response in the OpenAPI schema.
 class ModelResultItem(BaseModel):
     source_url: HttpUrl
     namespace: str
@@ -826,34 +995,89 @@ app = FastAPI(
     title="Ollama.com Library API Proxy",
     description="An API that fetches, parses, and caches data from ollama.com.",
     version=CODE_VERSION, # Version increment
+    default_response_class=ORJSONResponse, # Every endpoint serializes through orjson
 )
 
 # --- Helper Functions ---
 
-def get_cache_info_from_response(response: requests.Response) -> Dict[str, Any]:
-    """Gets cache information from a requests-cache response."""
-    cached_at = None
-    expires_at = None
-
-    if hasattr(response, 'created_at') and response.created_at: # type: ignore
-        cached_at_naive = response.created_at # type: ignore
-        cached_at = cached_at_naive.replace(tzinfo=timezone.utc) if cached_at_naive else None
-
-    if hasattr(response, 'expires') and response.expires: # type: ignore
-        expires_at_naive = response.expires # type: ignore
-        expires_at = expires_at_naive.replace(tzinfo=timezone.utc) if expires_at_naive else None
-    elif cached_at: # If created_at exists but expires is None, calculate based on default
-        default_expiry_seconds = 21600 # Default from install_cache
-        if hasattr(requests_cache.get_cache(), 'settings') and requests_cache.get_cache().settings.expire_after is not None: # type: ignore
-             default_expiry_seconds = requests_cache.get_cache().settings.expire_after # type: ignore
-        expires_at = cached_at + timedelta(seconds=default_expiry_seconds)
+# Patterns used on every parsed row, compiled once at import.
+RELATIVE_DATE_RE = re.compile(r"(\d+)\s+(minute|hour|day|week|month|year)s?\s+ago")
+ABSOLUTE_DATE_RE = re.compile(r"^\s*([a-z]{3})\s+(\d{1,2}),\s+(\d{4})\s+(1[0-2]|0?[1-9]):([0-5]?\d)\s+([ap]m)(?:\s+utc)?\s*$", re.IGNORECASE)
+PULL_COUNT_RE = re.compile(r"^([\d.]+)\s*([mk])?$")
+SIZE_RE = re.compile(r"^\s*([\d.,]+)\s*(?:([KMGT])I?B|B)?\s*$", re.IGNORECASE)
+UPDATED_AGO_RE = re.compile(r"\d+ \w+ ago")
+BLOB_DIGEST_RE = re.compile(r"^[0-9a-fA-F]{12,}$")
+TAGS_COUNT_RE = re.compile(r'(\d+)\s+Tags')
+MOBILE_DIGEST_RE = re.compile(r"[0-9a-f]{7,}")
+GGUF_SPLIT_RE = re.compile(r'[·, ]+')
+GGUF_ARCH_RE = re.compile(r"^[^\W\d]+$") # A single word with no digits
+GGUF_PARAMS_RE = re.compile(r"^\d+(\.\d+)?[a-z]+$")
+GGUF_QUANT_RE = re.compile(r"^[fq]\d+(_\d+|[a-z_]+)?$")
+GGUF_QUANTS = frozenset({
+    "q2_k", "q3_k_s", "q3_k_m", "q3_k_l", "q4_0", "q4_1", "q4_k_s",
+    "q4_k_m", "q5_0", "q5_1", "q5_k_s", "q5_k_m", "q6_k", "q8_0",
+})
+
+class CacheInfo(TypedDict):
+    """The CacheInfoMixin fields, kept a plain dict so endpoints can spread it straight into a response model."""
+    fetched_at: datetime
+    cached_at: Optional[datetime]
+    cache_expires_at: Optional[datetime]
+    from_cache: bool
+
+def get_cache_info_from_response(response: httpx.Response) -> CacheInfo:
+    """Gets cache information from the extensions hishel sets on a response."""
+    extensions = response.extensions
+    fetched_at = datetime.now(timezone.utc)
+    if not extensions.get("from_cache", False):
+        return CacheInfo(fetched_at=fetched_at, cached_at=None, cache_expires_at=None, from_cache=False)
+
+    # Freshly stored entries carry an aware datetime, entries read back from SQLite a naive UTC one
+    cached_at = extensions["cache_metadata"]["created_at"].replace(tzinfo=timezone.utc)
+    return CacheInfo(
+        fetched_at=fetched_at,
+        cached_at=cached_at,
+        cache_expires_at=cached_at + CACHE_LIFETIME,
+        from_cache=True
+    )
 
-    return {
-        "fetched_at": datetime.now(timezone.utc),
-        "cached_at": cached_at,
-        "cache_expires_at": expires_at,
-        "from_cache": getattr(response, 'from_cache', False)
-    }
+@lru_cache(maxsize=8)
+def site_origin(base_url: str) -> str:
+    parts = urlsplit(base_url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+def join_site_url(base_url: str, href: str) -> str:
+    """urljoin with a fast path for the root-relative hrefs ollama.com uses on every row."""
+    if href.startswith('/') and not href.startswith('//'):
+        return site_origin(base_url) + href
+    return urljoin(base_url, href)
+
+class ResponseCache:
+    """In-process LRU of rendered responses with a per-entry expiry, so hot queries skip fetching, parsing and validation."""
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.entries: "OrderedDict[Any, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: Any) -> Optional[Any]:
+        entry = self.entries.get(key)
+        if entry is None: return None
+        expires_at, body = entry
+        if expires_at <= time.time():
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return body
+
+    def put(self, key: Any, body: Any, expires_at: float):
+        self.entries[key] = (expires_at, body)
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+@lru_cache(maxsize=4096)
+def normalize_path_segment(segment: str) -> str:
+    """Lowercases a URL path segment; a handful of namespaces and models dominate traffic, so results are cached and interned."""
+    return sys.intern(segment.lower())
 
 def make_full_model_name(namespace: str, model_base_name: str) -> str:
     if namespace == "library":
@@ -864,19 +1088,43 @@ def make_full_tag_name(namespace: str, model_base_name: str, tag_part: str) -> s
     full_model_name = make_full_model_name(namespace, model_base_name)
     return f"{full_model_name}:{tag_part}"
 
+PULL_COUNT_MULTIPLIERS = {
+    "m": 1_000_000,
+    "k": 1_000,
+}
+
+# The same count/size strings recur across rows and pages; lru_cache's C lookup skips the regex on repeats
+@lru_cache(maxsize=4096)
 def parse_pull_count(pull_str: str) -> int:
-    pull_str = pull_str.lower().replace(',', '').strip()
-    if not pull_str: return 0
-    if 'm' in pull_str:
-        return int(float(pull_str.replace('m', '')) * 1_000_000)
-    elif 'k' in pull_str:
-        return int(float(pull_str.replace('k', '')) * 1_000)
+    match = PULL_COUNT_RE.match(pull_str.lower().replace(',', '').strip())
+    if not match: return 0
+    count, suffix = match.groups()
     try:
-        return int(pull_str)
+        return int(float(count) * PULL_COUNT_MULTIPLIERS[suffix]) if suffix else int(count)
     except ValueError:
         return 0
 
-def parse_relative_date_to_datetime(relative_str: str, base_time: datetime = datetime.now(timezone.utc)) -> datetime:
+# Month and year are approximations
+RELATIVE_DATE_UNITS = {
+    "minute": timedelta(minutes=1),
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+    "week": timedelta(weeks=1),
+    "month": timedelta(days=30),
+    "year": timedelta(days=365),
+}
+
+@lru_cache(maxsize=512)
+def relative_date_offset(relative_str: str) -> Optional[timedelta]:
+    """How far back an "N units ago" phrase points, or None. Pages repeat a small vocabulary of these, so results are cached."""
+    match = RELATIVE_DATE_RE.match(relative_str)
+    if match:
+        return int(match.group(1)) * RELATIVE_DATE_UNITS[match.group(2)]
+    return None
+
+def parse_relative_date_to_datetime(relative_str: str, base_time: Optional[datetime] = None) -> datetime:
+    if base_time is None: # Evaluated per call; a datetime.now() default would be frozen at import time
+        base_time = datetime.now(timezone.utc)
     relative_str = relative_str.lower().strip()
     if "just now" in relative_str or "moments ago" in relative_str:
         return base_time
@@ -884,75 +1132,164 @@ def parse_relative_date_to_datetime(relative_str: str, base_time: datetime = dat
         # Set time to midnight of yesterday
         return base_time.replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=1)
 
-    match = re.match(r"(\d+)\s+(minute|hour|day|week|month|year)s?\s+ago", relative_str)
-    if match:
-        value = int(match.group(1))
-        unit = match.group(2)
-        if unit == "minute": return base_time - timedelta(minutes=value)
-        if unit == "hour": return base_time - timedelta(hours=value)
-        if unit == "day": return base_time - timedelta(days=value)
-        if unit == "week": return base_time - timedelta(weeks=value)
-        # Approximation for month/year
-        if unit == "month": return base_time - timedelta(days=value * 30)
-        if unit == "year": return base_time - timedelta(days=value * 365)
+    # Only the phrase-to-offset step is cached; applying it to base_time keeps results exact rather than snapped
+    offset = relative_date_offset(relative_str)
+    if offset is not None:
+        return base_time - offset
 
     print(f"Warning: Could not parse relative date '{relative_str}'. Returning base_time.")
     return base_time
 
+MONTH_NUMBERS = {abbr: number for number, abbr in enumerate("jan feb mar apr may jun jul aug sep oct nov dec".split(), start=1)}
+
 def parse_ollama_absolute_date_str(date_str: str) -> datetime:
+    # Matches e.g. "Jun 7, 2024 10:05 AM UTC" by hand; strptime's locale and format handling is slow per row
     try:
-        dt_naive = datetime.strptime(date_str.replace(" UTC", "").strip(), '%b %d, %Y %I:%M %p')
-        return dt_naive.replace(tzinfo=timezone.utc)
+        match = ABSOLUTE_DATE_RE.match(date_str)
+        if not match:
+            raise ValueError(f"time data '{date_str}' does not match format '%b %d, %Y %I:%M %p'")
+        month_abbr, day, year, hour, minute, meridiem = match.groups()
+        month = MONTH_NUMBERS.get(month_abbr.lower())
+        if month is None:
+            raise ValueError(f"unknown month abbreviation '{month_abbr}'")
+        hour = int(hour) % 12 + (12 if meridiem.lower() == "pm" else 0)
+        return datetime(int(year), month, int(day), hour, int(minute), tzinfo=timezone.utc)
     except ValueError as e:
         print(f"Warning: Could not parse absolute date string '{date_str}': {e}. Using current time.")
         return datetime.now(timezone.utc)
 
+# Binary multipliers keyed by the unit letter captured by SIZE_RE (KB and KiB are treated alike)
+SIZE_UNIT_MULTIPLIERS = {
+    None: 1, # Plain number or Bytes (B)
+    "K": 1 << 10,
+    "M": 1 << 20,
+    "G": 1 << 30,
+    "T": 1 << 40,
+}
+
+@lru_cache(maxsize=4096)
 def parse_size_str_to_bytes(size_str: str) -> int:
     if not size_str: return 0
-    size_str_upper = size_str.upper().strip()
-
-    val_str = re.sub(r"[^0-9.]", "", size_str)
-    if not val_str: return 0
+    match = SIZE_RE.match(size_str)
+    if not match: return 0
     try:
-        val = float(val_str)
+        val = float(match.group(1).replace(",", ""))
     except ValueError:
         return 0
 
-    if "KB" in size_str_upper or "KIB" in size_str_upper: return int(val * 1024)
-    if "MB" in size_str_upper or "MIB" in size_str_upper: return int(val * 1024 * 1024)
-    if "GB" in size_str_upper or "GIB" in size_str_upper: return int(val * 1024 * 1024 * 1024)
-    if "TB" in size_str_upper or "TIB" in size_str_upper: return int(val * 1024 * 1024 * 1024 * 1024)
-    # Assuming plain number or Bytes (B) is bytes
-    try:
-        return int(val)
-    except ValueError:
-        return 0
+    unit = match.group(2)
+    return int(val * SIZE_UNIT_MULTIPLIERS[unit.upper() if unit else None])
 
 # --- HTML Parsing Functions ---
 
-def parse_model_listing_item(item_li: BeautifulSoup, base_url: str) -> Optional[Dict[str, Any]]:
-    anchor = item_li.select_one('a[href]')
-    if not anchor: return None
-
-    raw_source_url = anchor['href']
-    source_url = urljoin(base_url, raw_source_url)
-
-    path_parts = urlparse(source_url).path.strip('/').split('/')
+# Every page type is parsed with lxml directly; these selectors are compiled to XPath once at import.
+LISTING_ITEMS_SELECTOR = CSSSelector('ul[role="list"] li[x-test-model]', translator='html')
+LISTING_ANCHOR_SELECTOR = CSSSelector('a[href]', translator='html')
+LISTING_TITLE_SELECTOR = CSSSelector('h2 span[x-test-search-response-title]', translator='html')
+LISTING_H2_SELECTOR = CSSSelector('h2', translator='html')
+LISTING_MODEL_TITLE_SELECTOR = CSSSelector('div[x-test-model-title]', translator='html')
+LISTING_DESCRIPTION_SELECTOR = CSSSelector('p.max-w-lg.break-words', translator='html')
+LISTING_PULL_COUNT_SELECTOR = CSSSelector('span[x-test-pull-count]', translator='html')
+LISTING_TAG_COUNT_SELECTOR = CSSSelector('span[x-test-tag-count]', translator='html')
+LISTING_UPDATED_SELECTOR = CSSSelector('span[x-test-updated]', translator='html')
+LISTING_BADGE_SELECTOR = CSSSelector('span[x-test-capability], span[x-test-size]', translator='html')
+
+# The model page's one-off landmarks: id() is answered from libxml2's table of id attributes without walking the
+# tree, and the [1] queries stop at their first match, where the CSS selectors they replace walked every element.
+ELEMENT_BY_ID_XPATH = lxml.etree.XPath("id($id)")
+MODEL_NAME_XPATH = lxml.etree.XPath("descendant::a[@x-test-model-name and @title][1]")
+MODEL_PULL_COUNT_XPATH = lxml.etree.XPath("descendant::span[@x-test-pull-count][1]")
+MODEL_UPDATED_XPATH = lxml.etree.XPath("descendant::span[@x-test-updated][1]")
+MODEL_TAG_SELECTION_XPATH = lxml.etree.XPath("descendant::section[@x-test-model-tag-selection][1]")
+MODEL_TAGS_LINK_XPATH = lxml.etree.XPath("descendant::a[@x-test-tags-link][1]")
+MODEL_BADGE_SELECTOR = CSSSelector('div.flex-wrap span.bg-indigo-50, span[x-test-size]', translator='html')
+MODEL_ACTIVE_TAG_SELECTOR = CSSSelector('button[name="tag"] div.truncate', translator='html')
+MODEL_COMMAND_INPUT_SELECTOR = CSSSelector('input.command[name="command"]', translator='html')
+MODEL_FILE_EXPLORER_SECTION_XPATH = lxml.etree.XPath('descendant::section[1]') # Within #file-explorer
+MODEL_FILES_UPDATED_SELECTOR = CSSSelector('div.bg-neutral-50 > p:first-of-type', translator='html')
+MODEL_FILE_LINK_SELECTOR = CSSSelector('a.group.block.grid-cols-12', translator='html')
+MODEL_FILE_NAME_SELECTOR = CSSSelector('div.sm\\:col-span-2', translator='html')
+MODEL_FILE_SIZE_SELECTOR = CSSSelector('div.sm\\:col-start-12', translator='html')
+MODEL_FILE_SNIPPET_SELECTOR = CSSSelector('div.sm\\:col-span-8', translator='html')
+MODEL_README_DISPLAY_XPATH = lxml.etree.XPath("descendant::*[@id='display'][1]") # Within #readme
+MODEL_TAGS_NAV_LINK_SELECTOR = CSSSelector('a[href]', translator='html')
+MODEL_TAGS_NAV_NAME_SELECTOR = CSSSelector('span.truncate span.group-hover\\:underline', translator='html')
+MODEL_TAGS_NAV_SIZE_SELECTOR = CSSSelector('span.text-xs.text-neutral-400', translator='html')
+
+BLOB_PRE_SELECTOR = CSSSelector('pre', translator='html')
+# The rest of a well-formed tag after its name; attribute values holding '<' or stray quotes are left to lxml
+BLOB_TAG_REST = rb"""(?:\s++[^\s"'<>/=]++(?:\s*+=\s*+(?:"[^"<]*+"|'[^'<]*+'|[^\s"'<>=`]++))?)*+\s*+/?>"""
+BLOB_RAW_TEXT_TAGS = (b'script', b'style', b'textarea', b'title', b'xmp', b'iframe', b'noembed', b'noframes')
+# Everything up to and including the first <pre> start tag that lxml would also parse as one. Comments and raw-text
+# elements (script, style, textarea...), whose text can hold a '<pre', are stepped over. Anything libxml2 recovers from
+# in its own way (malformed tags, CDATA, an abrupt <!-->, a comment opener inside raw text, <plaintext>) stops the
+# match, and the page takes the full parse. Possessive quantifiers keep a failed match linear.
+BLOB_PRE_OPEN_RE = re.compile(
+    rb'(?:[^<]++'
+    rb'|<(?![a-z/!?])'
+    rb'|<!--(?!-?>)(?:[^-]++|-(?!->))*+-->'
+    rb'|<!doctype\s[^>]*+>'
+    + b''.join(rb'|<' + tag + rb'(?![a-z0-9-])' + BLOB_TAG_REST + rb'(?:[^<]++|<(?!/' + tag + rb'\s*>|!--))*+</' + tag + rb'\s*>' for tag in BLOB_RAW_TEXT_TAGS) +
+    rb'|</[a-z][a-z0-9-]*+' + BLOB_TAG_REST +
+    rb'|<(?!(?:pre|plaintext|' + b'|'.join(BLOB_RAW_TEXT_TAGS) + rb')(?![a-z0-9-]))[a-z][a-z0-9-]*+' + BLOB_TAG_REST +
+    rb')*+<pre(?![a-z0-9-])' + BLOB_TAG_REST,
+    re.IGNORECASE)
+
+TAGS_ITEMS_SELECTOR = CSSSelector('ul > li.group.p-3', translator='html')
+TAGS_ANCHOR_SELECTOR = CSSSelector('a.hover\\:underline', translator='html')
+TAGS_DIGEST_SELECTOR = CSSSelector('div.font-mono.text-\\[13px\\]', translator='html')
+TAGS_DETAILS_SELECTOR = CSSSelector('div.hidden.md\\:grid', translator='html')
+TAGS_GRID_SELECTOR = CSSSelector('div.grid.grid-cols-12', translator='html')
+TAGS_TITLED_SPAN_SELECTOR = CSSSelector('span[title]', translator='html')
+TAGS_MOBILE_DETAILS_SELECTOR = CSSSelector('a.md\\:hidden span:not([class*="group-hover:underline"])', translator='html')
+TAGS_BADGE_SELECTOR = CSSSelector('span.text-blue-600', translator='html')
+
+# Pages are handed over as the raw response bytes so nothing decodes them before libxml2 does.
+# ollama.com always serves UTF-8, so pin it rather than let libxml2 fall back to latin-1 on pages without a <meta charset>.
+# Endpoints parse on the threadpool; an lxml parser locks around each parse, so every thread gets its own.
+html_parsers = threading.local()
+
+def parse_html_document(html_content: bytes) -> lxml.html.HtmlElement:
+    """Parses a page into its <html> root; an empty body gives an empty root instead of raising."""
+    if not html_content or html_content.isspace(): return lxml.html.Element('html')
+    parser = getattr(html_parsers, "parser", None)
+    if parser is None:
+        parser = html_parsers.parser = lxml.html.HTMLParser(encoding='utf-8')
+    return lxml.html.document_fromstring(html_content, parser=parser)
+
+def select_first(selector: Union[CSSSelector, lxml.etree.XPath], element: lxml.html.HtmlElement) -> Optional[lxml.html.HtmlElement]:
+    matches = selector(element)
+    return matches[0] if matches else None
+
+def element_by_id(document: lxml.html.HtmlElement, element_id: str) -> Optional[lxml.html.HtmlElement]:
+    matches = ELEMENT_BY_ID_XPATH(document, id=element_id)
+    return matches[0] if matches else None
+
+def element_text(element: lxml.html.HtmlElement, separator: str = "") -> str:
+    """lxml equivalent of BeautifulSoup's get_text(separator, strip=True)."""
+    if not len(element):
+        # Leaf cells (sizes, counts, digests) carry a single text node; skip the itertext walk.
+        return (element.text or "").strip()
+    return separator.join(text for text in (raw.strip() for raw in element.itertext()) if text)
+
+def parse_model_listing_item(item_li: lxml.html.HtmlElement, base_url: str, base_time: Optional[datetime] = None) -> Optional[Dict[str, Any]]:
+    anchor = select_first(LISTING_ANCHOR_SELECTOR, item_li)
+    if anchor is None: return None
+
+    raw_source_url = anchor.get('href')
+    source_url = join_site_url(base_url, raw_source_url)
+
+    path_parts = urlparse(source_url).path.strip('/').lower().split('/')
     namespace = "library" # Default
     model_base_name = ""
 
-    if len(path_parts) >= 2:
-        if path_parts[0].lower() == 'library' and len(path_parts) > 1:
-            namespace = 'library'
-            model_base_name = path_parts[1].lower()
-        elif path_parts[0].lower() != 'library': # User namespace
-            namespace = path_parts[0].lower()
-            model_base_name = path_parts[1].lower()
+    if len(path_parts) >= 2: # 'library/<model>' or '<user>/<model>'
+        namespace, model_base_name = path_parts[0], path_parts[1]
 
     # Robust parsing of model name from title or URL
-    title_h2_span = item_li.select_one('h2 span[x-test-search-response-title]')
-    if title_h2_span:
-        full_name_from_title = title_h2_span.get_text(strip=True)
+    title_h2_span = select_first(LISTING_TITLE_SELECTOR, item_li)
+    if title_h2_span is not None:
+        full_name_from_title = element_text(title_h2_span)
         if '/' in full_name_from_title:
             ns_from_title, mbn_from_title = full_name_from_title.split('/',1)
             namespace = ns_from_title.lower()
@@ -960,10 +1297,10 @@ def parse_model_listing_item(item_li: BeautifulSoup, base_url: str) -> Optional[
         elif namespace == "library": # If it's a library model, title is just base_name
             model_base_name = full_name_from_title.lower()
 
-    if not model_base_name or (namespace != "library" and '/' not in item_li.select_one('h2').get_text()): # Refine fallback check
-        title_div = item_li.select_one('div[x-test-model-title]')
-        if title_div and title_div.has_attr('title'):
-             full_name_from_title_attr = title_div['title'].lower()
+    if not model_base_name or (namespace != "library" and '/' not in select_first(LISTING_H2_SELECTOR, item_li).text_content()): # Refine fallback check
+        title_div = select_first(LISTING_MODEL_TITLE_SELECTOR, item_li)
+        if title_div is not None and title_div.get('title') is not None:
+             full_name_from_title_attr = title_div.get('title').lower()
              if '/' in full_name_from_title_attr :
                  namespace, model_base_name = full_name_from_title_attr.split('/',1)
              else:
@@ -973,32 +1310,35 @@ def parse_model_listing_item(item_li: BeautifulSoup, base_url: str) -> Optional[
     if not model_base_name:
         return None
 
-    description_p = item_li.select_one('p.max-w-lg.break-words')
-    description = description_p.get_text(separator=" ", strip=True) if description_p else ""
+    description_p = select_first(LISTING_DESCRIPTION_SELECTOR, item_li)
+    description = element_text(description_p, separator=" ") if description_p is not None else ""
 
-    pull_count_span = item_li.select_one('span[x-test-pull-count]')
-    pull_count_str = pull_count_span.get_text(strip=True) if pull_count_span else "0"
+    pull_count_span = select_first(LISTING_PULL_COUNT_SELECTOR, item_li)
+    pull_count_str = element_text(pull_count_span) if pull_count_span is not None else "0"
     pull_count = parse_pull_count(pull_count_str)
 
-    tags_count_span = item_li.select_one('span[x-test-tag-count]')
-    tags_count = int(tags_count_span.get_text(strip=True)) if tags_count_span and tags_count_span.get_text(strip=True).isdigit() else 0
+    tags_count_span = select_first(LISTING_TAG_COUNT_SELECTOR, item_li)
+    tags_count = int(element_text(tags_count_span)) if tags_count_span is not None and element_text(tags_count_span).isdigit() else 0
 
-    last_updated_iso_datetime = datetime.now(timezone.utc)
+    if base_time is None: base_time = datetime.now(timezone.utc)
+    last_updated_iso_datetime = base_time
     last_updated_str = ""
-    updated_span_el = item_li.select_one('span[x-test-updated]')
-    if updated_span_el:
-        last_updated_str = updated_span_el.get_text(strip=True)
-        parent_title_span = updated_span_el.find_parent('span', title=True)
-        if parent_title_span and parent_title_span['title']:
+    updated_span_el = select_first(LISTING_UPDATED_SELECTOR, item_li)
+    if updated_span_el is not None:
+        last_updated_str = element_text(updated_span_el)
+        parent_title_span = next((span for span in updated_span_el.iterancestors('span') if span.get('title') is not None), None)
+        if parent_title_span is not None and parent_title_span.get('title'):
             try:
-                last_updated_iso_datetime = parse_ollama_absolute_date_str(parent_title_span['title'])
+                last_updated_iso_datetime = parse_ollama_absolute_date_str(parent_title_span.get('title'))
             except ValueError:
-                last_updated_iso_datetime = parse_relative_date_to_datetime(last_updated_str)
+                last_updated_iso_datetime = parse_relative_date_to_datetime(last_updated_str, base_time)
         else:
-             last_updated_iso_datetime = parse_relative_date_to_datetime(last_updated_str)
+             last_updated_iso_datetime = parse_relative_date_to_datetime(last_updated_str, base_time)
 
-    capabilities = [cap.get_text(strip=True).lower() for cap in item_li.select('span[x-test-capability]')]
-    sizes = [size.get_text(strip=True).lower() for size in item_li.select('span[x-test-size]')]
+    # Capability and size badges come from one tree walk, routed by their marker attribute
+    capabilities, sizes = [], []
+    for badge in LISTING_BADGE_SELECTOR(item_li):
+        (capabilities if badge.get('x-test-capability') is not None else sizes).append(element_text(badge).lower())
 
     return {
         "source_url": source_url,
@@ -1015,100 +1355,92 @@ def parse_model_listing_item(item_li: BeautifulSoup, base_url: str) -> Optional[
         "sizes": sizes,
     }
 
-def parse_list_or_search_page_html(html_content: str, base_url: str = OLLAMA_COM_BASE_URL) -> List[Dict[str, Any]]:
-    soup = BeautifulSoup(html_content, 'html.parser')
+def parse_list_or_search_page_html(html_content: bytes, base_url: str = OLLAMA_COM_BASE_URL) -> List[Dict[str, Any]]:
+    if b'x-test-model' not in html_content: return [] # No result rows (or an empty body); skip building the tree
+    document = parse_html_document(html_content)
     model_items_data = []
-    list_items = soup.select('ul[role="list"] li[x-test-model]')
+    list_items = LISTING_ITEMS_SELECTOR(document)
+    now = datetime.now(timezone.utc) # One clock read shared by every item on the page
     for item_li in list_items:
-        parsed_item = parse_model_listing_item(item_li, base_url)
+        parsed_item = parse_model_listing_item(item_li, base_url, now)
         if parsed_item:
             model_items_data.append(parsed_item)
     return model_items_data
 
-def parse_model_page_html(html_content: str, page_url: str) -> Dict[str, Any]:
-    soup = BeautifulSoup(html_content, 'html.parser')
+def parse_model_page_html(html_content: bytes, page_url: str) -> Dict[str, Any]:
+    now = datetime.now(timezone.utc)
+    document = parse_html_document(html_content)
 
-    path_parts = urlparse(page_url).path.strip('/').split('/')
+    path_parts = urlparse(page_url).path.strip('/').lower().split('/')
     namespace = "library"
     model_base_name_from_url = ""
     active_tag_part_from_url = None
 
     if len(path_parts) >= 2:
-        ns_or_model = path_parts[0].lower()
-        model_or_tag = path_parts[1].lower()
-
-        if len(path_parts) >= 3 and path_parts[1].lower() != 'tags':
-             namespace = ns_or_model
-             model_tag_combo = model_or_tag
-             if ':' in model_tag_combo:
-                 model_base_name_from_url, active_tag_part_from_url = model_tag_combo.split(':', 1)
-             else:
-                 model_base_name_from_url = model_tag_combo
-        elif len(path_parts) >= 2 and path_parts[0].lower() == 'library':
-             namespace = 'library'
-             model_tag_combo = model_or_tag
-             if ':' in model_tag_combo:
-                 model_base_name_from_url, active_tag_part_from_url = model_tag_combo.split(':', 1)
-             else:
-                 model_base_name_from_url = model_tag_combo
-        elif len(path_parts) >=2 and path_parts[0].lower() != 'library': # user/model (no tag)
-            namespace = ns_or_model
-            model_base_name_from_url = model_or_tag
+        namespace, model_tag_combo = path_parts[0], path_parts[1]
+
+        if (len(path_parts) >= 3 and model_tag_combo != 'tags') or namespace == 'library':
+             model_base_name_from_url, _, tag_part_from_url = model_tag_combo.partition(':')
+             active_tag_part_from_url = tag_part_from_url or None
+        else: # user/model (no tag)
+            model_base_name_from_url = model_tag_combo
 
 
-    model_name_a = soup.select_one('a[x-test-model-name][title]')
-    model_base_name = model_name_a['title'].lower() if model_name_a else model_base_name_from_url
+    model_name_a = select_first(MODEL_NAME_XPATH, document)
+    model_title = model_name_a.get('title').lower() if model_name_a is not None else None # Lowercased once for every branch below
+    model_base_name = model_title if model_title is not None else model_base_name_from_url
 
-    if namespace == 'library' and model_name_a and '/' in model_name_a['title']:
-         ns_from_title, mbn_from_title = model_name_a['title'].lower().split('/', 1)
+    if namespace == 'library' and model_title is not None and '/' in model_title:
+         ns_from_title, mbn_from_title = model_title.split('/', 1)
          namespace = ns_from_title
          model_base_name = mbn_from_title
-    elif namespace != 'library' and model_name_a and '/' not in model_name_a['title'] and not model_base_name:
-         model_base_name = model_name_a['title'].lower() # Case: namespace from URL, model base name from title
-    elif not model_base_name and model_name_a: # General fallback if model_base_name is still not set
-         model_base_name = model_name_a['title'].lower()
+    elif namespace != 'library' and model_title is not None and '/' not in model_title and not model_base_name:
+         model_base_name = model_title # Case: namespace from URL, model base name from title
+    elif not model_base_name and model_title is not None: # General fallback if model_base_name is still not set
+         model_base_name = model_title
 
 
-    summary_span = soup.select_one('#summary-content span, #summary-content')
-    summary = summary_span.get_text(separator=" ", strip=True) if summary_span else "Summary not found."
-    if not summary.strip() or summary.strip().lower() == "no summary":
-        summary_textarea = soup.select_one('#summary-textarea')
-        if summary_textarea:
-            summary = summary_textarea.get_text(separator=" ", strip=True)
+    summary_span = element_by_id(document, "summary-content") # What "#summary-content span, #summary-content" matched first
+    summary = element_text(summary_span, separator=" ") if summary_span is not None else "Summary not found."
+    if not summary or summary.lower() == "no summary": # element_text output is already trimmed
+        summary_textarea = element_by_id(document, "summary-textarea")
+        if summary_textarea is not None:
+            summary = element_text(summary_textarea, separator=" ")
 
 
-    pull_count_span = soup.select_one('span[x-test-pull-count]')
-    pull_count_str = pull_count_span.get_text(strip=True) if pull_count_span else "0"
+    pull_count_span = select_first(MODEL_PULL_COUNT_XPATH, document)
+    pull_count_str = element_text(pull_count_span) if pull_count_span is not None else "0"
     pull_count = parse_pull_count(pull_count_str)
 
-    updated_span_relative = soup.select_one('span[x-test-updated]')
+    updated_span_relative = select_first(MODEL_UPDATED_XPATH, document)
     last_updated_str = ""
-    last_updated_iso = datetime.now(timezone.utc)
+    last_updated_iso = now
 
-    if updated_span_relative:
-        last_updated_str = updated_span_relative.get_text(strip=True)
-        parent_title_span = updated_span_relative.find_parent('span', title=True)
-        if parent_title_span and parent_title_span['title']:
+    if updated_span_relative is not None:
+        last_updated_str = element_text(updated_span_relative)
+        parent_title_span = next((span for span in updated_span_relative.iterancestors('span') if span.get('title') is not None), None)
+        if parent_title_span is not None and parent_title_span.get('title'):
             try:
-                last_updated_iso = parse_ollama_absolute_date_str(parent_title_span['title'])
-            except ValueError: last_updated_iso = parse_relative_date_to_datetime(last_updated_str)
-        else: last_updated_iso = parse_relative_date_to_datetime(last_updated_str)
+                last_updated_iso = parse_ollama_absolute_date_str(parent_title_span.get('title'))
+            except ValueError: last_updated_iso = parse_relative_date_to_datetime(last_updated_str, now)
+        else: last_updated_iso = parse_relative_date_to_datetime(last_updated_str, now)
 
-    capabilities = [cap.get_text(strip=True).lower() for cap in soup.select('div.flex-wrap span.bg-indigo-50')]
-    sizes = [size.get_text(strip=True).lower() for size in soup.select('span[x-test-size]')]
+    capabilities, sizes = [], []
+    for badge in MODEL_BADGE_SELECTOR(document):
+        (sizes if badge.get('x-test-size') is not None else capabilities).append(element_text(badge).lower())
 
-    tag_selection_section = soup.select_one('section[x-test-model-tag-selection]')
+    tag_selection_section = select_first(MODEL_TAG_SELECTION_XPATH, document)
     active_tag_part = active_tag_part_from_url
     tag_command = None
 
-    if tag_selection_section:
-        active_tag_button_div = tag_selection_section.select_one('button[name="tag"] div.truncate')
-        if active_tag_button_div and not active_tag_part:
-            active_tag_part = active_tag_button_div.get_text(strip=True).lower()
+    if tag_selection_section is not None:
+        active_tag_button_div = select_first(MODEL_ACTIVE_TAG_SELECTOR, tag_selection_section)
+        if active_tag_button_div is not None and not active_tag_part:
+            active_tag_part = element_text(active_tag_button_div).lower()
 
-        command_input = tag_selection_section.select_one('input.command[name="command"]')
-        if command_input:
-            tag_command = command_input['value']
+        command_input = select_first(MODEL_COMMAND_INPUT_SELECTOR, tag_selection_section)
+        if command_input is not None:
+            tag_command = command_input.get('value')
             if not active_tag_part and tag_command and ":" in tag_command:
                  active_tag_part = tag_command.split(":")[-1].lower()
             elif not active_tag_part and tag_command and model_base_name in tag_command:
@@ -1119,65 +1451,69 @@ def parse_model_page_html(html_content: str, page_url: str) -> Dict[str, Any]:
 
 
     tag_files_summary = []
-    file_explorer_section = soup.select_one('#file-explorer section')
-    if file_explorer_section:
+    file_explorer = element_by_id(document, "file-explorer")
+    file_explorer_section = select_first(MODEL_FILE_EXPLORER_SECTION_XPATH, file_explorer) if file_explorer is not None else None
+    if file_explorer_section is not None:
         listing_updated_str_fe = ""
         #listing_updated_iso_fe = None # Not used for now
-        updated_p_fe = file_explorer_section.select_one('div.bg-neutral-50 > p:first-of-type')
-        if updated_p_fe:
-             listing_updated_str_raw_fe = updated_p_fe.get_text(strip=True)
+        updated_p_fe = select_first(MODEL_FILES_UPDATED_SELECTOR, file_explorer_section)
+        if updated_p_fe is not None:
+             listing_updated_str_raw_fe = element_text(updated_p_fe)
              if "Updated" in listing_updated_str_raw_fe:
                  listing_updated_str_fe = listing_updated_str_raw_fe.replace("Updated","").strip()
-             elif re.match(r"\d+ \w+ ago", listing_updated_str_raw_fe): # Handles "X days ago"
+             elif UPDATED_AGO_RE.match(listing_updated_str_raw_fe): # Handles "X days ago"
                  listing_updated_str_fe = listing_updated_str_raw_fe
 
 
-        for file_a in file_explorer_section.select('a.group.block.grid-cols-12'):
-            name_div = file_a.select_one('div.sm\\:col-span-2')
-            name = name_div.get_text(strip=True).lower() if name_div else "unknown"
+        for file_a in MODEL_FILE_LINK_SELECTOR(file_explorer_section):
+            name_div = select_first(MODEL_FILE_NAME_SELECTOR, file_a)
+            name = element_text(name_div).lower() if name_div is not None else "unknown"
 
-            blob_url_href = file_a['href']
-            blob_url = urljoin(OLLAMA_COM_BASE_URL, blob_url_href)
+            blob_url_href = file_a.get('href', '')
+            blob_url = join_site_url(OLLAMA_COM_BASE_URL, blob_url_href)
 
             url_path_parts = urlparse(blob_url).path.strip('/').split('/')
             digest_from_url = None
             if len(url_path_parts) > 1 and url_path_parts[-2] == "blobs":
-                digest_from_url = url_path_parts[-1]
-                if not re.match(r"^[0-9a-fA-F]{12,}$", digest_from_url): digest_from_url = None
+                digest_from_url = url_path_parts[-1].lower() # Stored lowercased, like name, so blob lookups compare directly
+                if not BLOB_DIGEST_RE.match(digest_from_url): digest_from_url = None
 
 
-            size_div = file_a.select_one('div.sm\\:col-start-12')
-            size_str = size_div.get_text(strip=True) if size_div else "0B"
+            size_div = select_first(MODEL_FILE_SIZE_SELECTOR, file_a)
+            size_str = element_text(size_div) if size_div is not None else "0B"
 
-            snippet_div = file_a.select_one('div.sm\\:col-span-8')
-            snippet = snippet_div.get_text(separator=" ", strip=True) if snippet_div else ""
+            snippet_div = select_first(MODEL_FILE_SNIPPET_SELECTOR, file_a)
+            snippet = element_text(snippet_div, separator=" ") if snippet_div is not None else ""
 
-            tag_files_summary.append(FileSummary(
+            tag_files_summary.append(FileSummary.construct(
                 name=name, blob_url=blob_url, digest=digest_from_url,
                 size_str=size_str, snippet=snippet, updated_str=listing_updated_str_fe
             ))
 
-    readme_div = soup.select_one('#readme #display')
-    readme_content = str(readme_div) if readme_div else "<p>Readme not found.</p>"
+    readme = element_by_id(document, "readme")
+    readme_div = select_first(MODEL_README_DISPLAY_XPATH, readme) if readme is not None else None
+    readme_content = lxml.html.tostring(readme_div, encoding='unicode', with_tail=False) if readme_div is not None else "<p>Readme not found.</p>"
 
     all_tags_dropdown_summary = []
-    tags_nav = soup.select_one('#tags-nav')
-    if tags_nav:
-        for tag_a_dropdown in tags_nav.select(f'a[href^="/library/"], a[href^="/{namespace}/"]'):
-            if "View all" in tag_a_dropdown.get_text(): continue
+    tags_nav = element_by_id(document, "tags-nav")
+    if tags_nav is not None:
+        tag_href_prefixes = ("/library/", f"/{namespace}/")
+        for tag_a_dropdown in MODEL_TAGS_NAV_LINK_SELECTOR(tags_nav):
+            if not tag_a_dropdown.get('href').startswith(tag_href_prefixes): continue
+            if "View all" in tag_a_dropdown.text_content(): continue
 
-            tag_name_span = tag_a_dropdown.select_one('span.truncate span.group-hover\\:underline')
-            tag_part_from_dropdown = tag_name_span.get_text(strip=True).lower() if tag_name_span else ""
+            tag_name_span = select_first(MODEL_TAGS_NAV_NAME_SELECTOR, tag_a_dropdown)
+            tag_part_from_dropdown = element_text(tag_name_span).lower() if tag_name_span is not None else ""
 
-            size_span_dropdown = tag_a_dropdown.select_one('span.text-xs.text-neutral-400')
-            size_str_from_dropdown = size_span_dropdown.get_text(strip=True) if size_span_dropdown else None
+            size_span_dropdown = select_first(MODEL_TAGS_NAV_SIZE_SELECTOR, tag_a_dropdown)
+            size_str_from_dropdown = element_text(size_span_dropdown) if size_span_dropdown is not None else None
 
-            is_active_tag_dropdown = ('bg-neutral-100' in tag_a_dropdown.get('class', []))
+            is_active_tag_dropdown = 'bg-neutral-100' in tag_a_dropdown.get('class', '').split()
 
             if not active_tag_part and is_active_tag_dropdown:
                 active_tag_part = tag_part_from_dropdown
 
-            all_tags_dropdown_summary.append(TagSummary(
+            all_tags_dropdown_summary.append(TagSummary.construct(
                 tag_part=tag_part_from_dropdown,
                 name_full_tag=make_full_tag_name(namespace, model_base_name, tag_part_from_dropdown),
                 size_str=size_str_from_dropdown,
@@ -1197,14 +1533,14 @@ def parse_model_page_html(html_content: str, page_url: str) -> Dict[str, Any]:
     active_tag_full_name = make_full_tag_name(namespace, model_base_name, active_tag_part) if active_tag_part else None
 
 
-    all_tags_page_link = soup.select_one('a[x-test-tags-link]')
-    all_tags_page_url_str = f"{OLLAMA_COM_BASE_URL}/{namespace}/{model_base_name}/tags" # Default construction
-    if all_tags_page_link and all_tags_page_link.has_attr('href'):
-        all_tags_page_url_str = urljoin(OLLAMA_COM_BASE_URL, all_tags_page_link['href'])
+    all_tags_page_link = select_first(MODEL_TAGS_LINK_XPATH, document)
+    all_tags_page_url_str = TAGS_PAGE_URL(ns=namespace, mbn=model_base_name) # Default construction
+    if all_tags_page_link is not None and all_tags_page_link.get('href') is not None:
+        all_tags_page_url_str = join_site_url(OLLAMA_COM_BASE_URL, all_tags_page_link.get('href'))
     
     total_tags_count_from_link = 0
-    if all_tags_page_link:
-        count_match = re.search(r'(\d+)\s+Tags', all_tags_page_link.get_text())
+    if all_tags_page_link is not None:
+        count_match = TAGS_COUNT_RE.search(all_tags_page_link.text_content())
         if count_match: total_tags_count_from_link = int(count_match.group(1))
 
     return {
@@ -1224,17 +1560,18 @@ def parse_model_page_html(html_content: str, page_url: str) -> Dict[str, Any]:
     }
 
 
-def parse_all_tags_page_html(html_content: str, page_url: str, model_namespace: str, model_base_name_in: str) -> Dict[str, Any]:
-    soup = BeautifulSoup(html_content, 'html.parser')
+def parse_all_tags_page_html(html_content: bytes, page_url: str, model_namespace: str, model_base_name_in: str) -> Dict[str, Any]:
     tags_list = []
+    expected_full_model_name = make_full_model_name(model_namespace, model_base_name_in).lower()
+    now = datetime.now(timezone.utc) # One clock read shared by every tag row
 
-    list_items = soup.select('ul > li.group.p-3')
+    # Every tag row links through a.hover:underline; without one there is nothing to parse
+    list_items = TAGS_ITEMS_SELECTOR(parse_html_document(html_content)) if b'hover:underline' in html_content else []
     for item_li in list_items:
-        tag_anchor = item_li.select_one('a.hover\\:underline')
-        if not tag_anchor or not tag_anchor.has_attr('href'): continue
+        tag_anchor = select_first(TAGS_ANCHOR_SELECTOR, item_li)
+        if tag_anchor is None or tag_anchor.get('href') is None: continue
 
-        full_tag_name_text_raw = tag_anchor.get_text(strip=True)
-        expected_full_model_name = make_full_model_name(model_namespace, model_base_name_in).lower()
+        full_tag_name_text_raw = element_text(tag_anchor)
         if ':' in full_tag_name_text_raw:
             parts = full_tag_name_text_raw.split(':',1) # Split only on first colon
             if len(parts) == 2 and parts[0].lower() == expected_full_model_name:
@@ -1248,40 +1585,42 @@ def parse_all_tags_page_html(html_content: str, page_url: str, model_namespace:
                  continue
 
 
-        source_url = urljoin(OLLAMA_COM_BASE_URL, tag_anchor['href'])
+        source_url = join_site_url(OLLAMA_COM_BASE_URL, tag_anchor.get('href'))
 
-        digest_span = item_li.select_one('div.font-mono.text-\\[13px\\]')
-        digest = digest_span.get_text(strip=True) if digest_span else "unknown-digest"
+        digest_div = select_first(TAGS_DIGEST_SELECTOR, item_li)
+        digest = element_text(digest_div) if digest_div is not None else "unknown-digest"
 
         size_str, context_window_str, input_type, modified_str = "N/A", None, None, "N/A"
-        modified_iso = datetime.now(timezone.utc)
-
-        details_div = item_li.select_one('div.hidden.md\\:grid')
-        if details_div:
-            cols = details_div.select('div.grid.grid-cols-12 > div')
-            if len(cols) > 1: size_str = cols[1].get_text(strip=True)
-            if len(cols) > 2: context_window_str = cols[2].get_text(strip=True) if cols[2].get_text(strip=True) != '-' else None
-            if len(cols) > 3: input_type = cols[3].get_text(strip=True) if cols[3].get_text(strip=True) != '-' else None
+        modified_iso = now
+
+        details_div = select_first(TAGS_DETAILS_SELECTOR, item_li)
+        if details_div is not None:
+            grid_div = select_first(TAGS_GRID_SELECTOR, details_div)
+            # One pass over the grid's direct children instead of a CSS match per column
+            col_divs = list(grid_div.iterchildren('div')) if grid_div is not None else []
+            cols = [element_text(col) for col in col_divs]
+            if len(cols) > 1: size_str = cols[1]
+            if len(cols) > 2: context_window_str = cols[2] if cols[2] != '-' else None
+            if len(cols) > 3: input_type = cols[3] if cols[3] != '-' else None
             if len(cols) > 4:
-                modified_str = cols[4].get_text(strip=True)
-                modified_span_title = cols[4].select_one('span[title]')
-                if modified_span_title and modified_span_title.has_attr('title'):
+                modified_str = cols[4]
+                modified_span_title = select_first(TAGS_TITLED_SPAN_SELECTOR, col_divs[4])
+                if modified_span_title is not None:
                      try:
-                          modified_iso = parse_ollama_absolute_date_str(modified_span_title['title'])
+                          modified_iso = parse_ollama_absolute_date_str(modified_span_title.get('title'))
                      except ValueError:
-                          modified_iso = parse_relative_date_to_datetime(modified_str)
+                          modified_iso = parse_relative_date_to_datetime(modified_str, now)
                 else:
-                     modified_iso = parse_relative_date_to_datetime(modified_str)
+                     modified_iso = parse_relative_date_to_datetime(modified_str, now)
 
         else:
-            mobile_details_span = item_li.select_one('a.md\\:hidden span:not([class*="group-hover:underline"])')
-            if mobile_details_span:
-                all_texts = [s.strip() for s in mobile_details_span.find_all(string=True, recursive=True) if s.strip()]
-                full_text = " ".join(all_texts)
+            mobile_details_span = select_first(TAGS_MOBILE_DETAILS_SELECTOR, item_li)
+            if mobile_details_span is not None:
+                full_text = element_text(mobile_details_span, " ")
                 parts = [p.strip() for p in full_text.split('•')]
 
                 if len(parts) > 0:
-                    digest_match = re.search(r"[0-9a-f]{7,}", parts[0]) # Shorter match for mobile digest
+                    digest_match = MOBILE_DIGEST_RE.search(parts[0]) # Shorter match for mobile digest
                     if digest_match: digest = digest_match.group(0)
 
                 for part_idx, part_text in enumerate(parts):
@@ -1291,13 +1630,12 @@ def parse_all_tags_page_html(html_content: str, page_url: str, model_namespace:
                     elif 'input' in part_lower: input_type = part_text.replace('input','').strip()
                     elif any(kw in part_lower for kw in ['ago', 'yesterday', 'now', 'updated', 'modified']):
                          modified_str = part_text
-                         modified_iso = parse_relative_date_to_datetime(modified_str)
+                         modified_iso = parse_relative_date_to_datetime(modified_str, now)
 
 
-        is_default_badge = item_li.select_one('span.text-blue-600:contains("Default")')
-        is_default = bool(is_default_badge)
+        is_default = any("Default" in badge.text_content() for badge in TAGS_BADGE_SELECTOR(item_li))
 
-        tags_list.append(TagDetailItem(
+        tags_list.append(TagDetailItem.construct(
             name_full_tag=make_full_tag_name(model_namespace, model_base_name_in, tag_part),
             tag_part=tag_part, source_url=source_url, digest=digest,
             size_str=size_str, size_bytes=parse_size_str_to_bytes(size_str),
@@ -1315,31 +1653,44 @@ def parse_all_tags_page_html(html_content: str, page_url: str, model_namespace:
     }
 
 
-def parse_blob_content_page_html(html_content: str) -> Optional[str]:
+def parse_blob_content_page_html(html_content: bytes) -> Optional[str]:
     """Parses a blob content page (e.g., for params, template) to extract text from <pre>."""
-    soup = BeautifulSoup(html_content, 'html.parser')
-    pre_tag = soup.select_one('pre')
-    if pre_tag:
-        return pre_tag.get_text()
+    # The <pre> of a blob page is plain escaped text, so slice it out of the bytes instead of building a DOM.
+    # Anything lxml would normalize differently (nested tags, CRs, NULs, bad UTF-8) takes the full parse,
+    # as does a page where BLOB_PRE_OPEN_RE can't be sure which <pre> lxml would pick.
+    pre_open = BLOB_PRE_OPEN_RE.match(html_content)
+    if pre_open is not None:
+        pre_end = html_content.find(b'</pre>', pre_open.end())
+        if pre_end != -1:
+            raw_text = html_content[pre_open.end():pre_end]
+            if b'<' not in raw_text and b'\r' not in raw_text and b'\x00' not in raw_text:
+                try:
+                    return html.unescape(raw_text.decode('utf-8'))
+                except UnicodeDecodeError:
+                    pass
+
+    pre_tag = select_first(BLOB_PRE_SELECTOR, parse_html_document(html_content))
+    if pre_tag is not None:
+        return pre_tag.text_content()
     return None
 
+@lru_cache(maxsize=512) # Snippets repeat across tags sharing a blob; the returned model is only ever read
 def parse_gguf_metadata_from_snippet(snippet: str) -> Optional[GGUFMetadata]:
     if not snippet or not isinstance(snippet, str): return None
 
     metadata = {}
-    parts = re.split(r'[·, ]+', snippet.lower().strip())
+    parts = GGUF_SPLIT_RE.split(snippet.lower().strip())
 
     for part in parts:
-        if part.startswith("arch:"):
-            metadata["arch"] = part.replace("arch:", "").strip()
-        elif part.startswith("parameters:"):
-            metadata["parameters"] = part.replace("parameters:", "").strip().upper()
-        elif part.startswith("quantization:"):
-            metadata["quantization"] = part.replace("quantization:", "").strip().upper()
-        elif re.match(r"^[^:]+$", part):
-             if re.match(r"^\w+$", part) and "arch" not in metadata and not any(c.isdigit() for c in part): metadata["arch"] = part
-             elif re.match(r"^\d+(\.\d+)?[a-z]+$", part) and "parameters" not in metadata: metadata["parameters"] = part.upper()
-             elif (re.match(r"^[fq]\d+(_\d+|[a-z_]+)?$", part) or part in ["q2_k", "q3_k_s", "q3_k_m", "q3_k_l", "q4_0", "q4_1", "q4_k_s", "q4_k_m", "q5_0", "q5_1", "q5_k_s", "q5_k_m", "q6_k", "q8_0"]) and "quantization" not in metadata: metadata["quantization"] = part.upper()
+        key, has_colon, value = part.partition(":")
+        if has_colon:
+            if key == "arch": metadata["arch"] = value.strip()
+            elif key == "parameters": metadata["parameters"] = value.strip().upper()
+            elif key == "quantization": metadata["quantization"] = value.strip().upper()
+        elif part: # Bare values without a key prefix
+             if "arch" not in metadata and GGUF_ARCH_RE.match(part): metadata["arch"] = part
+             elif GGUF_PARAMS_RE.match(part) and "parameters" not in metadata: metadata["parameters"] = part.upper()
+             elif (part in GGUF_QUANTS or GGUF_QUANT_RE.match(part)) and "quantization" not in metadata: metadata["quantization"] = part.upper()
 
 
     return GGUFMetadata(**metadata) if metadata else None
@@ -1347,9 +1698,120 @@ def parse_gguf_metadata_from_snippet(snippet: str) -> Optional[GGUFMetadata]:
 
 # --- API Endpoints (Reordered for FastAPI matching) ---
 
-
-
-app = FastAPI()
+@app.on_event("startup")
+async def start_cached_client():
+    global cached_client, cache_eviction_task, upstream_warmup_task
+    cached_client = await open_cached_client()
+    cache_eviction_task = asyncio.create_task(evict_expired_cache_entries())
+    upstream_warmup_task = asyncio.create_task(warm_upstream_connection()) # Runs alongside startup, never delays it
+
+@app.on_event("shutdown")
+async def stop_cached_client():
+    if upstream_warmup_task is not None:
+        upstream_warmup_task.cancel()
+    if cache_eviction_task is not None:
+        cache_eviction_task.cancel()
+        try: await cache_eviction_task
+        except asyncio.CancelledError: pass
+    if cached_client is not None:
+        await cached_client.aclose()
+
+class InflightFetch:
+    """An upstream GET shared by every request waiting on the same page, and how many are still waiting."""
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: "asyncio.Task[httpx.Response]"):
+        self.task = task
+        self.waiters = 0
+
+# Upstream GETs currently on the wire, keyed by URL and query, so concurrent requests for one page share one fetch
+inflight_fetches: Dict[Tuple[str, Optional[Tuple[Tuple[str, str], ...]]], InflightFetch] = {}
+
+def forget_inflight_fetch(key: Tuple, inflight: InflightFetch) -> None:
+    if inflight_fetches.get(key) is inflight:
+        del inflight_fetches[key]
+    if not inflight.task.cancelled():
+        inflight.task.exception() # Marks a failure as retrieved even when every waiter has gone away
+
+async def fetch_page(url: str, params: Optional[Dict[str, str]] = None) -> httpx.Response:
+    """
+    GETs url through the cached client, joining an identical fetch that is already in flight
+    instead of starting another. Responses are fully read, so every caller can share one.
+    The fetch is cancelled once every caller waiting on it has been cancelled.
+    """
+    key = (url, tuple(sorted(params.items())) if params else None)
+    inflight = inflight_fetches.get(key)
+    if inflight is None:
+        inflight = InflightFetch(asyncio.create_task(cached_client.get(url, params=params)))
+        inflight_fetches[key] = inflight
+        inflight.task.add_done_callback(lambda _: forget_inflight_fetch(key, inflight))
+    inflight.waiters += 1
+    try:
+        # Shielded so one caller going away doesn't cancel the fetch others still wait on
+        return await asyncio.shield(inflight.task)
+    finally:
+        inflight.waiters -= 1
+        if not inflight.waiters and not inflight.task.done():
+            # The last waiter was cancelled (client disconnect, unneeded fallback probe): stop the fetch too,
+            # and let the next request for this page start a fresh one instead of joining a cancelled task
+            if inflight_fetches.get(key) is inflight:
+                del inflight_fetches[key]
+            inflight.task.cancel()
+
+async def fetch_with_library_fallback(url: str, library_url: Optional[str]) -> Tuple[httpx.Response, str]:
+    """
+    Fetches url, falling back to library_url when it 404s. Both are requested at once so a miss
+    on the user namespace costs no extra round trip. Once url answers, the fallback probe is cancelled,
+    and so is its upstream fetch unless another request is waiting on that same library page.
+    Returns the response used and the URL it came from.
+    """
+    if library_url is None:
+        return await fetch_page(url), url
+
+    library_task = asyncio.create_task(fetch_page(library_url))
+    try:
+        response = await fetch_page(url)
+    except BaseException:
+        library_task.cancel()
+        raise
+    if response.status_code != 404:
+        library_task.cancel()
+        return response, url
+    return await library_task, library_url
+
+SORT_ORDERS = frozenset({"popular", "newest"})
+# ollama.com page URLs, built from templates bound once at import
+SEARCH_PAGE_URL = f"{OLLAMA_COM_BASE_URL}/search"
+NAMESPACE_PAGE_URL = (OLLAMA_COM_BASE_URL + "/{ns}").format
+MODEL_PAGE_URL = (OLLAMA_COM_BASE_URL + "/{ns}/{mbn}").format
+TAG_PAGE_URL = (OLLAMA_COM_BASE_URL + "/{ns}/{mbn}:{tp}").format
+TAGS_PAGE_URL = (OLLAMA_COM_BASE_URL + "/{ns}/{mbn}/tags").format
+# Blobs whose page is fetched for its full text; others only report the file-explorer snippet
+TEXT_BLOB_NAMES = frozenset({"params", "template", "license", "modelfile"})
+
+# /search response payloads, keyed on (q, o, c)
+search_response_cache = ResponseCache(maxsize=2048)
+# Page endpoint response payloads, keyed on the endpoint and its normalized arguments
+page_payload_cache = ResponseCache(maxsize=1024)
+
+# Endpoints return encoded responses rather than models: FastAPI would otherwise dump each model to a dict and
+# validate it against response_model again, per result row. response_model is still declared for the OpenAPI schema.
+# Models go to orjson as plain .dict() output; it encodes datetimes and HttpUrl (a str) itself, so jsonable_encoder's
+# recursive Python walk is skipped too.
+
+def get_page_payload(key: Tuple) -> Optional[Response]:
+    """Re-serves a page endpoint's payload from memory, skipping the fetch, the parse and response model validation."""
+    payload = page_payload_cache.get(key)
+    if payload is None: return None
+    return Response(content=orjson.dumps({**payload, "fetched_at": datetime.now(timezone.utc)}), media_type="application/json")
+
+def put_page_payload(key: Tuple, cache_info: CacheInfo, page_response: BaseModel) -> Response:
+    payload = page_response.dict()
+    # Later hits are served from memory, so store them marked as cached, expiring with the page they came from
+    cached_at = cache_info["cached_at"] or cache_info["fetched_at"]
+    expires_at = cache_info["cache_expires_at"] or cached_at + CACHE_LIFETIME
+    page_payload_cache.put(key, {**payload, "from_cache": True, "cached_at": cached_at, "cache_expires_at": expires_at}, expires_at.timestamp())
+    return ORJSONResponse(content=payload)
 
 # Store the last N ping durations (in seconds)
 ping_durations = deque(maxlen=100)
@@ -1357,17 +1819,15 @@ ping_durations = deque(maxlen=100)
 # Store the total bytes sent (simulated bandwidth usage)
 total_bytes_sent = 0
 
+# The simulated pong body never changes, so its size is measured once
+PONG_RESPONSE_SIZE = len(orjson.dumps({"message": "pong"}))
+
 @app.get("/ping")
 async def ping(request: Request):
     global total_bytes_sent
 
-    # Simulated pong response
-    response_data = {"message": "pong"}
-    response = JSONResponse(content=response_data)
-
     # Approximate response size in bytes
-    response_body = response.body
-    response_size = len(response_body)
+    response_size = PONG_RESPONSE_SIZE
     total_bytes_sent += response_size
 
     metrics = {
@@ -1377,17 +1837,57 @@ async def ping(request: Request):
         "last_response_size_bytes": response_size
     }
 
-    return JSONResponse(content=metrics)
-
+    return ORJSONResponse(content=metrics)
+
+
+# The landing page never changes while the process runs, so it is rendered and compressed once
+INDEX_HTML_BYTES = dummy_html_content.replace("VERSION_BEING_REPLACED", CODE_VERSION).encode("utf-8")
+INDEX_HTML_GZIP = gzip.compress(INDEX_HTML_BYTES, 9)
+INDEX_HTML_BROTLI = brotli.compress(INDEX_HTML_BYTES, quality=11) if brotli else None
+APP_JS_BYTES = dummy_script_content.replace("VERSION_BEING_REPLACED", CODE_VERSION).encode("utf-8")
+APP_JS_GZIP = gzip.compress(APP_JS_BYTES, 9)
+APP_JS_BROTLI = brotli.compress(APP_JS_BYTES, quality=11) if brotli else None
+# index.html requests app.js?v=<CODE_VERSION>, so a release never reuses a stale script
+APP_JS_CACHE_CONTROL = "public, max-age=86400"
+
+@lru_cache(maxsize=256)
+def accepted_encodings(accept_encoding: str) -> Dict[str, float]:
+    """Maps each coding listed in an Accept-Encoding header to its q-value (1 when not given)."""
+    codings = {}
+    for token in accept_encoding.split(","):
+        coding, _, parameters = token.partition(";")
+        coding = coding.strip().lower()
+        if not coding: continue
+        quality = 1.0
+        for parameter in parameters.split(";"):
+            name, _, value = parameter.partition("=")
+            if name.strip().lower() == "q":
+                try: quality = float(value)
+                except ValueError: quality = 0.0 # A malformed weight is not an acceptance
+        codings[coding] = quality
+    return codings
+
+def accepts_encoding(accept_encoding: str, coding: str) -> bool:
+    codings = accepted_encodings(accept_encoding)
+    return codings.get(coding, codings.get("*", 0.0)) > 0
+
+def precompressed_response(request: Request, body: bytes, gzip_body: bytes, brotli_body: Optional[bytes], media_type: str, headers: Optional[Dict[str, str]] = None) -> Response:
+    headers = {**(headers or {}), "Vary": "Accept-Encoding"}
+    accept_encoding = request.headers.get("accept-encoding", "")
+    if brotli_body is not None and accepts_encoding(accept_encoding, "br"):
+        return Response(content=brotli_body, media_type=media_type, headers={**headers, "Content-Encoding": "br"})
+    if accepts_encoding(accept_encoding, "gzip"):
+        return Response(content=gzip_body, media_type=media_type, headers={**headers, "Content-Encoding": "gzip"})
+    return Response(content=body, media_type=media_type, headers=headers)
 
 @app.get("/", include_in_schema=False)
-async def read_index():
-    return HTMLResponse(content=dummy_html_content.replace("VERSION_BEING_REPLACED", CODE_VERSION)) # Had a lot of errors, just return html to fix everything ;)
-    script_dir = os.path.dirname(__file__)
-    html_file_path = os.path.join(script_dir, "static", FILETEMPTEXT)
-    if not os.path.exists(html_file_path):
-        return HTMLResponse(content=dummy_html_content or "<h1>Ollama Library API</h1><p>index.html not found. See <a href='/docs'>API Documentation</a>.</p>", status_code=404)
-    return FileResponse(path=html_file_path, media_type="text/html")
+async def read_index(request: Request):
+    return precompressed_response(request, INDEX_HTML_BYTES, INDEX_HTML_GZIP, INDEX_HTML_BROTLI, "text/html")
+
+# Registered ahead of the /{namespace} routes, which would otherwise claim this path
+@app.get("/app.js", include_in_schema=False)
+async def read_app_js(request: Request):
+    return precompressed_response(request, APP_JS_BYTES, APP_JS_GZIP, APP_JS_BROTLI, "text/javascript", {"Cache-Control": APP_JS_CACHE_CONTROL})
 
 
 @app.get("/search", response_model=SearchResponse, summary="Search Models")
@@ -1396,42 +1896,52 @@ async def search_models(
     o: Optional[str] = Query("popular", description="Sort order: 'popular' or 'newest'."),
     c: Optional[str] = Query(None, description="Comma-separated list of capabilities to filter by.")
 ):
-    if o not in ["popular", "newest"]:
+    if o not in SORT_ORDERS:
         raise HTTPException(status_code=400, detail="Invalid sort order 'o'. Must be 'popular' or 'newest'.")
 
     params = {"q": q, "o": o}
     if c:
         params["c"] = c.lower()
 
-    search_url = f"{OLLAMA_COM_BASE_URL}/search"
+    # Keyed on exactly what reaches ollama.com; q is not case-folded since it is echoed back in the response
+    search_cache_key = (q, o, params.get("c"))
+    cached_payload = search_response_cache.get(search_cache_key)
+    if cached_payload is not None:
+        # fetched_at is stamped per response, as get_page_payload does for the page endpoints
+        return Response(content=orjson.dumps({**cached_payload, "fetched_at": datetime.now(timezone.utc)}), media_type="application/json")
+
     try:
-        response = cached_session.get(search_url, params=params)
+        response = await fetch_page(SEARCH_PAGE_URL, params=params)
         response.raise_for_status()
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         raise HTTPException(status_code=503, detail=f"Failed to fetch search results from ollama.com: {e}")
 
     cache_info = get_cache_info_from_response(response)
-    parsed_results_data = parse_list_or_search_page_html(response.text, base_url=OLLAMA_COM_BASE_URL)
+    parsed_results_data = await run_in_threadpool(parse_list_or_search_page_html, response.content, OLLAMA_COM_BASE_URL)
 
-    final_results = []
     capabilities_list_for_filterinfo = None
     if c:
-        requested_caps = set(cap.strip().lower() for cap in c.split(','))
-        capabilities_list_for_filterinfo = sorted(list(requested_caps))
-        for model_data in parsed_results_data:
-            model_caps_set = set(model_data.get("capabilities", []))
-            if requested_caps.issubset(model_caps_set):
-                final_results.append(ModelResultItem(**model_data))
+        requested_caps = frozenset(cap.strip().lower() for cap in c.split(','))
+        capabilities_list_for_filterinfo = sorted(requested_caps)
+        # The parser always emits a capabilities list, so no per-item set or .get() is needed
+        final_results = [model_data for model_data in parsed_results_data if requested_caps.issubset(model_data["capabilities"])]
     else:
-        final_results = [ModelResultItem(**model_data) for model_data in parsed_results_data]
+        final_results = parsed_results_data
 
-    return SearchResponse(
+    search_response = SearchResponse.construct(
         query=q, sort_order=o,
         filters=FilterInfo(capabilities=capabilities_list_for_filterinfo) if capabilities_list_for_filterinfo else None,
         results=final_results,
         **cache_info
     )
 
+    # Later hits are served from memory, so store them marked as cached, expiring with the page they came from
+    cached_at = cache_info["cached_at"] or cache_info["fetched_at"]
+    expires_at = cache_info["cache_expires_at"] or cached_at + CACHE_LIFETIME
+    cached_response = search_response.copy(update={"from_cache": True, "cached_at": cached_at, "cache_expires_at": expires_at})
+    search_response_cache.put(search_cache_key, cached_response.dict(), expires_at.timestamp())
+    return ORJSONResponse(content=search_response.dict())
+
 @app.get("/{namespace}/{model_base_name}:{tag_part}/blobs/{blob_identifier}", response_model=BlobDetailsResponse, summary="Get Blob Information")
 async def get_blob_information(
     namespace: str = FastApiPath(..., description="Model namespace."),
@@ -1439,35 +1949,29 @@ async def get_blob_information(
     tag_part: str = FastApiPath(..., description="The tag part (e.g., '8b')."),
     blob_identifier: str = FastApiPath(..., description="Blob filename (e.g. 'model', 'params', 'template') or digest.")
 ):
-    norm_ns = namespace.lower()
-    norm_mbn = model_base_name.lower()
-    norm_tp = tag_part.lower()
-    norm_bi = blob_identifier.lower()
+    norm_ns = normalize_path_segment(namespace)
+    norm_mbn = normalize_path_segment(model_base_name)
+    norm_tp = normalize_path_segment(tag_part)
+    norm_bi = normalize_path_segment(blob_identifier)
 
-    tag_page_url = f"{OLLAMA_COM_BASE_URL}/{norm_ns}/{norm_mbn}:{norm_tp}"
+    tag_page_url = TAG_PAGE_URL(ns=norm_ns, mbn=norm_mbn, tp=norm_tp)
+    library_tag_url = TAG_PAGE_URL(ns='library', mbn=norm_mbn, tp=norm_tp) if norm_ns != 'library' else None
     try:
-        tag_page_response = cached_session.get(tag_page_url)
+        tag_page_response, tag_page_url = await fetch_with_library_fallback(tag_page_url, library_tag_url)
         if tag_page_response.status_code == 404:
-             if norm_ns != 'library':
-                 library_tag_url = f"{OLLAMA_COM_BASE_URL}/library/{norm_mbn}:{norm_tp}"
-                 tag_page_response = cached_session.get(library_tag_url)
-                 if tag_page_response.status_code == 404:
-                     raise HTTPException(status_code=404, detail=f"Tag page for '{make_full_tag_name(namespace, model_base_name, tag_part)}' not found.")
-                 norm_ns = 'library'
-                 tag_page_url = library_tag_url
-             else:
-                raise HTTPException(status_code=404, detail=f"Tag page for '{make_full_tag_name(namespace, model_base_name, tag_part)}' not found.")
+            raise HTTPException(status_code=404, detail=f"Tag page for '{make_full_tag_name(namespace, model_base_name, tag_part)}' not found.")
+        if tag_page_url == library_tag_url:
+            norm_ns = 'library'
         tag_page_response.raise_for_status()
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         raise HTTPException(status_code=503, detail=f"Failed to fetch tag page: {e}")
 
-    parsed_tag_page = parse_model_page_html(tag_page_response.text, tag_page_url)
+    parsed_tag_page = await run_in_threadpool(parse_model_page_html, tag_page_response.content, tag_page_url)
 
-    found_file_summary: Optional[FileSummary] = None
-    for fs in parsed_tag_page.get("tag_files_summary", []):
-        if fs.name.lower() == norm_bi or (fs.digest and fs.digest.lower().startswith(norm_bi)):
-            found_file_summary = fs
-            break
+    found_file_summary: Optional[FileSummary] = next(
+        (fs for fs in parsed_tag_page["tag_files_summary"] if fs.name == norm_bi or (fs.digest and fs.digest.startswith(norm_bi))),
+        None
+    )
 
     if not found_file_summary:
         raise HTTPException(status_code=404, detail=f"Blob identifier '{blob_identifier}' not found for tag '{make_full_tag_name(norm_ns, norm_mbn, norm_tp)}'.")
@@ -1477,23 +1981,22 @@ async def get_blob_information(
     gguf_metadata_snippet = None
     parsed_gguf_metadata = None
     blob_detail_url = found_file_summary.blob_url
-    blob_cache_info = get_cache_info_from_response(tag_page_response)
-    text_blob_names = ["params", "template", "license", "modelfile"]
+    blob_cache_response = tag_page_response # Replaced by the blob page's response once that is fetched
 
-    if found_file_summary.name in text_blob_names:
+    if found_file_summary.name in TEXT_BLOB_NAMES:
         try:
-            blob_content_response = cached_session.get(str(blob_detail_url))
+            blob_content_response = await fetch_page(str(blob_detail_url))
             blob_content_response.raise_for_status()
-            blob_cache_info = get_cache_info_from_response(blob_content_response)
+            blob_cache_response = blob_content_response
             content_type = blob_content_response.headers.get("Content-Type", "")
             if "text/html" in content_type:
-                 text_content = parse_blob_content_page_html(blob_content_response.text)
+                 text_content = await run_in_threadpool(parse_blob_content_page_html, blob_content_response.content)
             else:
                  text_content = blob_content_response.text
             if text_content and found_file_summary.name == "params":
-                try: parsed_json_content = json.loads(text_content)
-                except json.JSONDecodeError: pass
-        except requests.exceptions.RequestException as e:
+                try: parsed_json_content = orjson.loads(text_content)
+                except orjson.JSONDecodeError: pass
+        except httpx.HTTPError as e:
             print(f"Warning: Could not fetch blob content from {blob_detail_url}: {e}. Using snippet.")
             text_content = found_file_summary.snippet
     elif found_file_summary.name == "model":
@@ -1507,7 +2010,7 @@ async def get_blob_information(
     if found_file_summary.updated_str: # updated_str is from the file listing section overall
          listing_updated_iso_val = parse_relative_date_to_datetime(found_file_summary.updated_str)
 
-    return BlobDetailsResponse(
+    return ORJSONResponse(content=BlobDetailsResponse.construct(
         name_full_tag=make_full_tag_name(norm_ns, norm_mbn, norm_tp),
         canonical_name=found_file_summary.name,
         source_url=blob_detail_url,
@@ -1519,8 +2022,8 @@ async def get_blob_information(
         parsed_gguf_metadata=parsed_gguf_metadata,
         listing_updated_str=found_file_summary.updated_str,
         listing_updated_iso=listing_updated_iso_val,
-        **blob_cache_info
-    )
+        **get_cache_info_from_response(blob_cache_response)
+    ).dict())
 
 @app.get("/{namespace}/{model_base_name}:{tag_part}", response_model=ModelPageResponse, summary="Get Specific Tag Details")
 async def get_specific_tag_details(
@@ -1528,35 +2031,34 @@ async def get_specific_tag_details(
     model_base_name: str = FastApiPath(..., description="Base name of the model."),
     tag_part: str = FastApiPath(..., description="The tag part (e.g., 'latest', '8b').")
 ):
-    norm_ns = namespace.lower()
-    norm_mbn = model_base_name.lower()
-    norm_tp = tag_part.lower()
-    tag_page_url = f"{OLLAMA_COM_BASE_URL}/{norm_ns}/{norm_mbn}:{norm_tp}"
+    norm_ns = normalize_path_segment(namespace)
+    norm_mbn = normalize_path_segment(model_base_name)
+    norm_tp = normalize_path_segment(tag_part)
+    tag_page_url = TAG_PAGE_URL(ns=norm_ns, mbn=norm_mbn, tp=norm_tp)
+    library_tag_url = TAG_PAGE_URL(ns='library', mbn=norm_mbn, tp=norm_tp) if norm_ns != 'library' else None
+    payload_key = ("tag", norm_ns, norm_mbn, norm_tp)
+    cached_payload = get_page_payload(payload_key)
+    if cached_payload is not None: return cached_payload
 
     try:
-        response = cached_session.get(tag_page_url)
+        response, tag_page_url = await fetch_with_library_fallback(tag_page_url, library_tag_url)
         if response.status_code == 404:
-            if norm_ns != 'library':
-                 library_tag_url = f"{OLLAMA_COM_BASE_URL}/library/{norm_mbn}:{norm_tp}"
-                 response = cached_session.get(library_tag_url)
-                 if response.status_code == 404:
-                     raise HTTPException(status_code=404, detail=f"Tag page '{namespace}/{model_base_name}:{tag_part}' not found.")
-                 norm_ns = 'library'
-                 tag_page_url = library_tag_url
-            else:
-                 raise HTTPException(status_code=404, detail=f"Tag page '{namespace}/{model_base_name}:{tag_part}' not found.")
+            raise HTTPException(status_code=404, detail=f"Tag page '{namespace}/{model_base_name}:{tag_part}' not found.")
+        if tag_page_url == library_tag_url:
+            norm_ns = 'library'
         response.raise_for_status()
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         raise HTTPException(status_code=503, detail=f"Failed to fetch specific tag page: {e}")
 
     cache_info = get_cache_info_from_response(response)
-    parsed_data = parse_model_page_html(response.text, tag_page_url)
+
+    parsed_data = await run_in_threadpool(parse_model_page_html, response.content, tag_page_url)
     parsed_data['active_tag_part'] = norm_tp
     parsed_data['active_tag_full_name'] = make_full_tag_name(norm_ns, norm_mbn, norm_tp)
     for ts in parsed_data.get("all_tags_dropdown_summary", []):
         ts.is_active = (ts.tag_part == norm_tp)
 
-    return ModelPageResponse(**parsed_data, **cache_info)
+    return put_page_payload(payload_key, cache_info, ModelPageResponse.construct(**parsed_data, **cache_info))
 
 
 @app.get("/{namespace}/{model_base_name}/tags", response_model=AllTagsResponse, summary="List All Tags for a Model")
@@ -1564,29 +2066,28 @@ async def list_all_tags(
     namespace: str = FastApiPath(..., description="Model namespace."),
     model_base_name: str = FastApiPath(..., description="Base name of the model.")
 ):
-    norm_ns = namespace.lower()
-    norm_mbn = model_base_name.lower()
-    tags_page_url = f"{OLLAMA_COM_BASE_URL}/{norm_ns}/{norm_mbn}/tags"
+    norm_ns = normalize_path_segment(namespace)
+    norm_mbn = normalize_path_segment(model_base_name)
+    tags_page_url = TAGS_PAGE_URL(ns=norm_ns, mbn=norm_mbn)
+    library_tags_url = TAGS_PAGE_URL(ns='library', mbn=norm_mbn) if norm_ns != 'library' else None
+    payload_key = ("tags", norm_ns, norm_mbn)
+    cached_payload = get_page_payload(payload_key)
+    if cached_payload is not None: return cached_payload
     try:
-        response = cached_session.get(tags_page_url)
+        response, tags_page_url = await fetch_with_library_fallback(tags_page_url, library_tags_url)
         if response.status_code == 404:
-             if norm_ns != 'library':
-                 library_tags_url = f"{OLLAMA_COM_BASE_URL}/library/{norm_mbn}/tags"
-                 response = cached_session.get(library_tags_url)
-                 if response.status_code == 404:
-                     raise HTTPException(status_code=404, detail=f"Tags page for model '{namespace}/{model_base_name}' not found.")
-                 norm_ns = 'library'
-                 tags_page_url = library_tags_url
-             else:
-                 raise HTTPException(status_code=404, detail=f"Tags page for model '{namespace}/{model_base_name}' not found.")
+            raise HTTPException(status_code=404, detail=f"Tags page for model '{namespace}/{model_base_name}' not found.")
+        if tags_page_url == library_tags_url:
+            norm_ns = 'library'
         response.raise_for_status()
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         raise HTTPException(status_code=503, detail=f"Failed to fetch tags page: {e}")
 
     cache_info = get_cache_info_from_response(response)
-    parsed_data = parse_all_tags_page_html(response.text, tags_page_url, norm_ns, norm_mbn)
 
-    return AllTagsResponse(**parsed_data, **cache_info)
+    parsed_data = await run_in_threadpool(parse_all_tags_page_html, response.content, tags_page_url, norm_ns, norm_mbn)
+
+    return put_page_payload(payload_key, cache_info, AllTagsResponse.construct(**parsed_data, **cache_info))
 
 
 @app.get("/{namespace}/{model_base_name}", response_model=ModelPageResponse, summary="Get Model Details")
@@ -1594,26 +2095,28 @@ async def get_model_details(
     namespace: str = FastApiPath(..., description="Model namespace."),
     model_base_name: str = FastApiPath(..., description="Base name of the model.")
 ):
-    page_url = f"{OLLAMA_COM_BASE_URL}/{namespace.lower()}/{model_base_name.lower()}"
+    norm_ns = normalize_path_segment(namespace)
+    norm_mbn = normalize_path_segment(model_base_name)
+    page_url = MODEL_PAGE_URL(ns=norm_ns, mbn=norm_mbn)
+    # Try with 'library' namespace too if original was not 'library'
+    lib_page_url = MODEL_PAGE_URL(ns='library', mbn=norm_mbn) if norm_ns != 'library' else None
+    payload_key = ("model", norm_ns, norm_mbn)
+    cached_payload = get_page_payload(payload_key)
+    if cached_payload is not None: return cached_payload
     try:
-        response = cached_session.get(page_url)
+        response, page_url = await fetch_with_library_fallback(page_url, lib_page_url)
         if response.status_code == 404:
-             # Try with 'library' namespace if original was not 'library'
-            if namespace.lower() != 'library':
-                lib_page_url = f"{OLLAMA_COM_BASE_URL}/library/{model_base_name.lower()}"
-                response = cached_session.get(lib_page_url)
-                if response.status_code == 404:
-                    raise HTTPException(status_code=404, detail=f"Model '{namespace}/{model_base_name}' (and as 'library/{model_base_name}') not found.")
-                page_url = lib_page_url # Use library URL if found
-            else: # Original was 'library' and not found
-                raise HTTPException(status_code=404, detail=f"Model '{namespace}/{model_base_name}' not found.")
+            if lib_page_url:
+                raise HTTPException(status_code=404, detail=f"Model '{namespace}/{model_base_name}' (and as 'library/{model_base_name}') not found.")
+            raise HTTPException(status_code=404, detail=f"Model '{namespace}/{model_base_name}' not found.") # Original was 'library' and not found
         response.raise_for_status()
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         raise HTTPException(status_code=503, detail=f"Failed to fetch model details: {e}")
 
     cache_info = get_cache_info_from_response(response)
-    parsed_data = parse_model_page_html(response.text, page_url)
-    return ModelPageResponse(**parsed_data, **cache_info)
+
+    parsed_data = await run_in_threadpool(parse_model_page_html, response.content, page_url)
+    return put_page_payload(payload_key, cache_info, ModelPageResponse.construct(**parsed_data, **cache_info))
 
 
 @app.get("/{namespace}", response_model=ModelListByNamespaceResponse, summary="List Models by Namespace")
@@ -1622,64 +2125,74 @@ async def list_models_by_namespace(
     o: Optional[str] = Query('popular', description="Sort order: 'newest' or 'popular'."),
     c: Optional[str] = Query(None, description="Comma-separated list of capabilities to filter by.")
 ):
-    if o not in ["newest", "popular"]:
+    if o not in SORT_ORDERS:
         raise HTTPException(status_code=400, detail="Sort order 'o' must be 'newest' or 'popular'.")
 
-    norm_namespace = namespace.lower()
-    
-    # Determine the actual path on ollama.com
-    if norm_namespace == "library":
-        ollama_com_path = "/library"
-    else:
-        ollama_com_path = f"/{norm_namespace}"
-
-    target_fetch_url = f"{OLLAMA_COM_BASE_URL}{ollama_com_path}"
+    norm_namespace = normalize_path_segment(namespace)
+    target_fetch_url = NAMESPACE_PAGE_URL(ns=norm_namespace) # /library and /{user} pages share one layout
     
     params = {"sort": o} # ollama.com uses 'sort' for both /library and /{user} pages
     if c:
         params["c"] = c.lower()
 
+    payload_key = ("namespace", norm_namespace, o, c)
+    cached_payload = get_page_payload(payload_key)
+    if cached_payload is not None: return cached_payload
+
     try:
-        response = cached_session.get(target_fetch_url, params=params)
+        response = await fetch_page(target_fetch_url, params=params)
         if response.status_code == 404:
             raise HTTPException(status_code=404, detail=f"Namespace '{namespace}' not found on ollama.com.")
         response.raise_for_status()
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         raise HTTPException(status_code=503, detail=f"Failed to fetch models for namespace '{namespace}': {e}")
 
     cache_info = get_cache_info_from_response(response)
+
     # The parse_list_or_search_page_html should work for both /library and /user_name pages
     # as the HTML structure for model listings is similar.
-    parsed_results_data = parse_list_or_search_page_html(response.text, base_url=OLLAMA_COM_BASE_URL)
+    parsed_results_data = await run_in_threadpool(parse_list_or_search_page_html, response.content, OLLAMA_COM_BASE_URL)
 
-    final_results = []
     capabilities_list_for_filterinfo = None
     if c:
-        requested_caps = set(cap.strip().lower() for cap in c.split(','))
-        capabilities_list_for_filterinfo = sorted(list(requested_caps))
-        for model_data in parsed_results_data:
-            model_caps_set = set(model_data.get("capabilities", []))
-            if requested_caps.issubset(model_caps_set):
-                final_results.append(ModelResultItem(**model_data))
+        requested_caps = frozenset(cap.strip().lower() for cap in c.split(','))
+        capabilities_list_for_filterinfo = sorted(requested_caps)
+        # The parser always emits a capabilities list, so no per-item set or .get() is needed
+        final_results = [model_data for model_data in parsed_results_data if requested_caps.issubset(model_data["capabilities"])]
     else:
-        final_results = [ModelResultItem(**model_data) for model_data in parsed_results_data]
+        final_results = parsed_results_data
 
-    return ModelListByNamespaceResponse(
+    return put_page_payload(payload_key, cache_info, ModelListByNamespaceResponse.construct(
         queried_namespace=norm_namespace,
         sort_order=o,
         filters=FilterInfo(capabilities=capabilities_list_for_filterinfo) if capabilities_list_for_filterinfo else None,
         results=final_results,
         **cache_info
-    )
+    ))
+
 
+if not Static_Website:
+    for static_page in ('static/index.html', 'static/app.js'):
+        if os.path.exists(static_page):
+            os.remove(static_page)
 
-if not format.startswith('.'):
-    format = f'.{format}'
-if not Static_Website and os.path.exists('static/index.html'):
-    os.remove('static/index.html')
+def write_static_page(path: str, content: bytes) -> bool:
+    """Writes content to path unless the file already holds exactly it. Returns whether it wrote."""
+    try:
+        with open(path, "rb") as f:
+            if f.read() == content:
+                return False
+    except FileNotFoundError:
+        pass
+    # Write beside the target and swap it in, so whatever serves static/ never reads a half-written page
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(content)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+    return True
 
-if Static_Website == False:
-    filename = f'{FILETEMPTEXT}'
 # --- Main execution ---
 if __name__ == "__main__":
     print("Starting Ollama Library API (Live Fetch) server...")
@@ -1689,28 +2202,30 @@ if __name__ == "__main__":
         print(f"Created static directory: {static_dir}")
 
     index_html_path = os.path.join(static_dir, filename)
-    if not os.path.exists(index_html_path):
-    # Replace placeholder before writing to file
-        modified_html_content = dummy_html_content.replace("VERSION_BEING_REPLACED", CODE_VERSION)
-        
-        # Write the modified content
-        with open(index_html_path, "w") as f:
-            f.write(modified_html_content)
-        
-        print(f"Created dummy index.html at: {index_html_path}")
-
-    print("OpenAPI docs available at http://localhost:5115/docs")
-    print("Landing page available at http://localhost:5115/")
-    print("\nExample test URLs (fetches live data from ollama.com):")
-    print("  Models in 'library' namespace (popular): http://localhost:5115/library?o=popular")
-    print("  Models by user 'jmorganca' (popular): http://localhost:5115/jmorganca?o=popular")
-    print("  Models in 'library' (newest, filter vision): http://localhost:5115/library?o=newest&c=vision")
-    print("  Search 'qwen': http://localhost:5115/search?q=qwen&o=popular")
-    print("  Model details (library/qwen2): http://localhost:5115/library/qwen2")
-    print("  Model details (jmorganca/codellama): http://localhost:5115/jmorganca/codellama")
-    print("  Model specific tag (library/qwen2:7b): http://localhost:5115/library/qwen2:7b")
-    print("  All tags for (library/qwen2): http://localhost:5115/library/qwen2/tags")
-    print("  Blob info (library/qwen2:7b, model): http://localhost:5115/library/qwen2:7b/blobs/model")
-    print("  Blob info (library/qwen2:7b, params): http://localhost:5115/library/qwen2:7b/blobs/params")
-
-    uvicorn.run(app, host="0.0.0.0", port=5115)
\ No newline at end of file
+    if Static_Website:
+        # Write the pages already rendered (version substituted) for the / and /app.js routes,
+        # leaving files that already hold this release untouched
+        if write_static_page(index_html_path, INDEX_HTML_BYTES):
+            print(f"Created dummy index.html at: {index_html_path}")
+        write_static_page(os.path.join(static_dir, "app.js"), APP_JS_BYTES)
+
+    # One write for the whole banner instead of a print (and stdout lock/flush) per line
+    print("""OpenAPI docs available at http://localhost:5115/docs
+Landing page available at http://localhost:5115/
+
+Example test URLs (fetches live data from ollama.com):
+  Models in 'library' namespace (popular): http://localhost:5115/library?o=popular
+  Models by user 'jmorganca' (popular): http://localhost:5115/jmorganca?o=popular
+  Models in 'library' (newest, filter vision): http://localhost:5115/library?o=newest&c=vision
+  Search 'qwen': http://localhost:5115/search?q=qwen&o=popular
+  Model details (library/qwen2): http://localhost:5115/library/qwen2
+  Model details (jmorganca/codellama): http://localhost:5115/jmorganca/codellama
+  Model specific tag (library/qwen2:7b): http://localhost:5115/library/qwen2:7b
+  All tags for (library/qwen2): http://localhost:5115/library/qwen2/tags
+  Blob info (library/qwen2:7b, model): http://localhost:5115/library/qwen2:7b/blobs/model
+  Blob info (library/qwen2:7b, params): http://localhost:5115/library/qwen2:7b/blobs/params""")
+
+    # Workers import the app by name; uvloop and httptools are picked up automatically when installed (uvicorn[standard])
+    app_import_path = f"{os.path.splitext(os.path.basename(__file__))[0]}:app"
+    uvicorn.run(app_import_path if SERVER_WORKERS > 1 else app, host="0.0.0.0", port=5115,
+                workers=SERVER_WORKERS, backlog=4096, access_log=False)
\ No newline at end of file
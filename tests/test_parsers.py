@@ -0,0 +1,109 @@
+"""
+Regression check for the ollama.com page parsers.
+
+The pages in fixtures/ are hand-written reproductions of ollama.com markup, including the awkward parts
+(an <li x-test-model> inside a <script>, bad dates, missing sections). expected_parser_output.json holds what
+the original BeautifulSoup parsers (the baseline commit) returned for them, with the clock frozen at FROZEN_NOW.
+"""
+import json
+import os
+import sys
+import unittest
+from datetime import datetime, timezone
+from unittest import mock
+
+import orjson
+from pydantic import BaseModel
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import ollama_library_api as api
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+FROZEN_NOW = datetime(2025, 6, 1, 12, 0, 0, tzinfo=timezone.utc)
+
+class FrozenDatetime(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return FROZEN_NOW if tz is not None else FROZEN_NOW.replace(tzinfo=None)
+
+def read_fixture(name: str) -> bytes:
+    with open(os.path.join(FIXTURES_DIR, name), "rb") as f:
+        return f.read()
+
+def to_jsonable(value):
+    if isinstance(value, BaseModel): return value.dict()
+    if isinstance(value, datetime): return value.isoformat()
+    if isinstance(value, (set, frozenset)): return sorted(value)
+    raise TypeError(f"Unexpected parser output type {type(value).__name__}")
+
+def collect_parser_outputs(module) -> dict:
+    """Runs each page parser of module over the fixtures, as JSON-compatible data."""
+    with mock.patch.object(module, "datetime", FrozenDatetime):
+        outputs = {
+            "listing": module.parse_list_or_search_page_html(read_fixture("listing.html"), "https://ollama.com"),
+            "empty_listing": module.parse_list_or_search_page_html(read_fixture("empty_listing.html"), "https://ollama.com"),
+            "model": module.parse_model_page_html(read_fixture("model.html"), "https://ollama.com/library/qwen2"),
+            "model_tag": module.parse_model_page_html(read_fixture("model.html"), "https://ollama.com/library/qwen2:7b"),
+            "user_model": module.parse_model_page_html(read_fixture("user_model.html"), "https://ollama.com/jmorganca/codellama"),
+            "tags": module.parse_all_tags_page_html(read_fixture("tags.html"), "https://ollama.com/library/qwen2/tags", "library", "qwen2"),
+            "blob": module.parse_blob_content_page_html(read_fixture("blob.html")),
+        }
+    return orjson.loads(orjson.dumps(outputs, default=to_jsonable))
+
+class ParserRegressionTest(unittest.TestCase):
+    maxDiff = None
+
+    def test_parsers_match_baseline_output(self):
+        with open(os.path.join(FIXTURES_DIR, "expected_parser_output.json"), "rb") as f:
+            expected = json.load(f)
+        actual = collect_parser_outputs(api)
+        for page, expected_output in expected.items():
+            with self.subTest(page=page):
+                self.assertEqual(actual[page], expected_output)
+
+class BlobPreFastPathTest(unittest.TestCase):
+    """parse_blob_content_page_html slices the <pre> out of the bytes; it must agree with a full lxml parse."""
+    DECOYS = (
+        b'<script>const t = "<pre>x</pre>";</script>',
+        b'<SCRIPT>"<pre>x</pre>"</SCRIPT>',
+        b'<!-- <pre>x</pre> -->',
+        b'<textarea><pre>x</pre></textarea>',
+        b'<style>/*<pre>x</pre>*/</style>',
+        b'<title><pre>x</pre></title>',
+        b'<xmp><pre>x</pre></xmp>',
+        b'<iframe><pre>x</pre></iframe>',
+        b'<noembed><pre>x</pre></noembed>',
+        b'<div title="<pre>x</pre>"></div>',
+        b'<div title="<script>"></div><pre>x</pre><script></script>',
+        b'<!-- unclosed <pre>x</pre>',
+        b'<plaintext><pre>x</pre>',
+        b'<![CDATA[<pre>x</pre>]]>',
+        b'<!--><pre>x</pre>',
+        b'<script><!--<script></script><pre>x</pre></script>',
+        b'<div title="a>b" data-x=\'<pre>x</pre>\'></div>',
+    )
+
+    def lxml_pre_text(self, html_content: bytes):
+        pre_tag = api.select_first(api.BLOB_PRE_SELECTOR, api.parse_html_document(html_content))
+        return None if pre_tag is None else pre_tag.text_content()
+
+    def test_pre_hidden_ahead_of_the_real_one_is_skipped(self):
+        for decoy in self.DECOYS:
+            page = b'<!DOCTYPE html><html><head></head><body>' + decoy + b'<main><pre class="x">real &amp; text</pre></main></body></html>'
+            with self.subTest(decoy=decoy):
+                self.assertEqual(api.parse_blob_content_page_html(page), self.lxml_pre_text(page))
+
+    def test_closed_comments_and_raw_text_do_not_disable_the_fast_path(self):
+        page = (b'<!DOCTYPE html><html><head><title>params</title><script>const t = "<pre>x</pre>";</script>'
+                b'<!-- <pre>x</pre> --></head><body><pre class="x">real &amp; text</pre></body></html>')
+        with mock.patch.object(api, "parse_html_document", side_effect=AssertionError("took the full parse")):
+            self.assertEqual(api.parse_blob_content_page_html(page), "real & text")
+
+    def test_plain_page_matches_lxml(self):
+        for pre_body in (b'{\n  "stop": ["&lt;|im_end|&gt;"]\n}', b'', b'caf\xc3\xa9 &#169; &nbsp;x', b'a<b>bold</b>c', b'line\r\nline', b'\xff'):
+            page = b'<!DOCTYPE html><html><head></head><body><pre>' + pre_body + b'</pre></body></html>'
+            with self.subTest(pre_body=pre_body):
+                self.assertEqual(api.parse_blob_content_page_html(page), self.lxml_pre_text(page))
+
+if __name__ == "__main__":
+    unittest.main()